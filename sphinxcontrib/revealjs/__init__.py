@@ -9,7 +9,16 @@ from docutils import nodes
 from sphinx.application import Sphinx
 from sphinx.config import Config
 
-from . import addnodes, builder, transforms
+from . import (
+    addnodes,
+    assets,
+    builder,
+    compress,
+    lint,
+    outputs,
+    serviceworker,
+    transforms,
+)
 
 from .directives.slides import Interslide, Newslide
 from .directives.incremental import Incremental
@@ -25,8 +34,29 @@ def setup(app: Sphinx) -> None:
 
     # Setup builder and transforms
     app.add_builder(builder.RevealJSBuilder)
+    app.add_builder(lint.RevealJSLintBuilder)
     app.connect("doctree-read", transforms.migrate_transitions_to_newslides)
+    app.connect("doctree-read", transforms.note_theme_assets)
+    app.connect("doctree-read", transforms.compact_slide_nodes)
+    app.connect("env-get-outdated", assets.report_changed_assets)
+    app.connect("env-purge-doc", assets.purge_slide_assets)
+    app.connect("env-merge-info", assets.merge_slide_assets)
+    app.connect("build-finished", serviceworker.write_service_worker)
+    app.connect("build-finished", compress.write_sidecars, priority=600)
+    app.connect("build-finished", outputs.report_changed_outputs, priority=900)
     app.connect("doctree-resolved", transforms.process_newslides)
+    app.connect("doctree-resolved", transforms.prune_doctree, priority=900)
+    app.connect(
+        "doctree-resolved", transforms.vendor_remote_assets, priority=950
+    )
+
+    # Decks generated from data. Imported here so
+    # ``python -m sphinxcontrib.revealjs.decks`` doesn't import it twice.
+    from . import decks
+
+    app.add_source_parser(decks.DeckParser)
+    for suffix in decks.DECK_SUFFIXES:
+        app.add_source_suffix(suffix, "revealjs-deck")
 
     # Theme
     app.add_html_theme(
@@ -41,6 +71,24 @@ def setup(app: Sphinx) -> None:
     )
     app.add_config_value("revealjs_break_on_transition", True, "html")
     app.add_config_value("revealjs_newslides_inherit_titles", True, "html")
+    app.add_config_value("revealjs_compact_doctrees", True, "env")
+    app.add_config_value(
+        "revealjs_prune_nodes", ["Admonition", "sidebar", "topic"], "html"
+    )
+    app.add_config_value("revealjs_critical_css", False, "html")
+    app.add_config_value("revealjs_critical_css_slides", 3, "html")
+    app.add_config_value("revealjs_plugins", ["notes"], "html")
+    app.add_config_value("revealjs_multiplex", {}, "html")
+    app.add_config_value("revealjs_multiplex_master", False, "html")
+    app.add_config_value("revealjs_service_worker", False, "html")
+    app.add_config_value("revealjs_telemetry", None, "html")
+    app.add_config_value("revealjs_precompress", False, "html")
+    app.add_config_value("revealjs_vendor_remote_assets", False, "html")
+    app.add_config_value("revealjs_vendor_cache_dir", None, "")
+    app.add_config_value("revealjs_vendor_fetcher", None, "")
+    app.add_config_value("revealjs_vendor_max_age", 86400, "")
+    app.add_config_value("revealjs_lint_max_chars", 700, "")
+    app.add_config_value("revealjs_lint_max_lines", 14, "")
 
     # Nodes
     app.add_node(
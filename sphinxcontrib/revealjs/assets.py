@@ -0,0 +1,114 @@
+"""sphinxcontrib.revealjs.assets
+
+Track the assets each slide deck uses, such as background images and the
+RevealJS theme. Assets are recorded as document dependencies, so Sphinx
+only re-reads and re-writes the decks that use an asset when it changes.
+"""
+
+from typing import Dict, List, Set
+from os import path
+
+from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+
+def note_slide_asset(env: BuildEnvironment, asset: str) -> None:
+    """Record ``asset`` as a dependency of the current document.
+
+    ``asset`` should be absolute or relative to the source directory.
+    """
+
+    if not hasattr(env, "revealjs_assets"):
+        env.revealjs_assets = {}
+
+    env.note_dependency(asset)
+    env.revealjs_assets.setdefault(env.docname, set()).add(asset)
+
+
+def get_slide_images(env: BuildEnvironment, docname: str) -> List[str]:
+    """Return local images used by slides in ``docname``.
+
+    Images are relative to the source directory; absolute assets (like the
+    RevealJS theme) aren't copied with the document's images.
+    """
+
+    return sorted(
+        asset
+        for asset in getattr(env, "revealjs_assets", {}).get(docname, ())
+        if not path.isabs(asset)
+    )
+
+
+def get_asset_docnames(env: BuildEnvironment) -> Dict[str, Set[str]]:
+    """Return a reverse index of asset to the documents that use it."""
+
+    index: Dict[str, Set[str]] = {}
+    for docname, assets in getattr(env, "revealjs_assets", {}).items():
+        for asset in assets:
+            index.setdefault(asset, set()).add(docname)
+
+    return index
+
+
+def report_changed_assets(
+    app: Sphinx,
+    env: BuildEnvironment,
+    added: Set[str],
+    changed: Set[str],
+    removed: Set[str],
+) -> List[str]:
+    """Log which changed assets caused decks to be rebuilt.
+
+    Sphinx already marks these decks as changed, since their assets are
+    dependencies, so this doesn't add any documents.
+    """
+
+    for asset, docnames in sorted(get_asset_docnames(env).items()):
+        rebuilt = docnames & changed
+        if not rebuilt:
+            continue
+
+        try:
+            mtime = path.getmtime(path.join(env.srcdir, asset))
+        except OSError:
+            logger.info("slide asset %s is missing", asset)
+            continue
+
+        # env.all_docs holds the time each document was last read, in
+        # seconds.
+        if any(
+            mtime > env.all_docs[docname]
+            for docname in rebuilt
+            if docname in env.all_docs
+        ):
+            logger.info(
+                "slide asset %s changed; rebuilding %d decks",
+                asset,
+                len(rebuilt),
+            )
+
+    return []
+
+
+def purge_slide_assets(
+    app: Sphinx, env: BuildEnvironment, docname: str
+) -> None:
+    if hasattr(env, "revealjs_assets"):
+        env.revealjs_assets.pop(docname, None)
+
+
+def merge_slide_assets(
+    app: Sphinx,
+    env: BuildEnvironment,
+    docnames: Set[str],
+    other: BuildEnvironment,
+) -> None:
+    if not hasattr(env, "revealjs_assets"):
+        env.revealjs_assets = {}
+
+    for docname in docnames:
+        if docname in getattr(other, "revealjs_assets", {}):
+            env.revealjs_assets[docname] = other.revealjs_assets[docname]
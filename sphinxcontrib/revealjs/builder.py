@@ -4,17 +4,54 @@ The builder is used with transforms to convert default Sphinx HTML output to
 RevealJS-compatible HTML.
 """
 
-from typing import Dict, Any, Tuple, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from os import path
-from textwrap import dedent
+
+import hashlib
+import io
+import os
+import pickle
+import time
 
 from docutils import nodes
+from sphinx.locale import __
+from docutils.io import StringOutput
 from sphinx.util import logging, progress_message
 from sphinx.util.fileutil import copy_asset
-from sphinx.util.osutil import copyfile, ensuredir
-from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.util.osutil import copyfile, ensuredir, relative_uri
+from sphinx.builders.html import (
+    INVENTORY_FILENAME,
+    BuildInfo,
+    StandaloneHTMLBuilder,
+)
+from sphinx.util.inventory import InventoryFile
 from sphinx.writers.html5 import HTML5Translator
 
+from .assets import get_slide_images
+from .critical import extract_critical_css, opening_slides
+from .outputs import (
+    MASTER_SUFFIX,
+    replace_if_changed,
+    snapshot,
+    write_if_changed,
+)
+from .plugins import (
+    RevealJSPlugin,
+    find_used_plugins,
+    get_plugins,
+    initialize_script,
+)
+from .vendor import AssetCache
+
 IMG_EXTENSIONS = ["jpg", "png", "gif", "svg"]
 
 logger = logging.getLogger(__name__)
@@ -97,7 +134,336 @@ class RevealJSBuilder(StandaloneHTMLBuilder):
     search = False
 
     revealjs_dist = path.join(package_dir, "lib/revealjs/dist")
-    revealjs_plugindir = path.join(package_dir, "lib/revealjs/plugin")
+
+    def init(self) -> None:
+        super().init()
+
+        self.outputs_changed: List[str] = []
+
+        # docname -> when its page was last rendered. Unchanged pages keep
+        # their old modification time, so get_outdated_docs() uses this.
+        self.rendered: Dict[str, float] = {}
+        try:
+            with open(self.rendered_path, "rb") as f:
+                self.rendered = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        self.plugins = get_plugins(
+            self.config, self.confdir, bool(self.multiplex)
+        )
+
+        # docname -> names of plugins its deck uses. Kept across builds, so
+        # plugins used by decks that weren't rewritten are still copied.
+        self.deck_plugins: Dict[str, List[str]] = {}
+        try:
+            with open(self.deck_plugins_path, "rb") as f:
+                self.deck_plugins = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        # docname -> its master page, relative to the output directory. Kept
+        # across builds, so master pages of decks that weren't rewritten are
+        # still left out of sidecars and the changed files summary.
+        self.master_pages: Dict[str, str] = {}
+        try:
+            with open(self.master_pages_path, "rb") as f:
+                self.master_pages = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        # docname -> output files its deck uses, other than shared static
+        # files. Kept across builds like deck_plugins, for the service worker.
+        self.deck_files: Dict[str, List[str]] = {}
+        if self.config.revealjs_service_worker:
+            try:
+                with open(self.deck_files_path, "rb") as f:
+                    self.deck_files = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+
+        # docname -> (number of nodes, bytes of text) removed by
+        # transforms.prune_doctree
+        self.pruned: Dict[str, Tuple[int, int]] = {}
+
+        self.vendor_cache: Optional[AssetCache] = None
+        if self.config.revealjs_vendor_remote_assets:
+            self.vendor_cache = AssetCache(
+                self.config.revealjs_vendor_cache_dir
+                or path.join(self.doctreedir, "revealjs-vendor"),
+                self.config.revealjs_vendor_fetcher,
+                self.config.revealjs_vendor_max_age,
+            )
+
+        # cache key -> critical CSS of a deck's opening slides
+        self.critical_css: Dict[str, str] = {}
+        self.critical_css_used: Dict[str, str] = {}
+        # docname -> critical CSS of its deck, computed before it's written
+        self.deck_critical_css: Dict[str, str] = {}
+        self.stylesheets: Dict[str, Optional[str]] = {}
+
+        if self.config.revealjs_critical_css:
+            try:
+                with open(self.critical_css_path, "rb") as f:
+                    self.critical_css = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+
+    def build(
+        self,
+        docnames: Iterable[str],
+        summary: Optional[str] = None,
+        method: str = "update",
+    ) -> None:
+        # Compared with the output directory after the build, to report
+        # which files changed.
+        self.outputs_before = snapshot(self.outdir, self.doctreedir)
+        super().build(docnames, summary, method)
+
+    def get_outdated_docs(self) -> Iterator[str]:
+        """Yield documents whose page is older than their source.
+
+        Like Sphinx's, but pages are as old as their last render, not their
+        file: unchanged pages aren't rewritten, so their files keep their old
+        modification time.
+        """
+
+        try:
+            with open(path.join(self.outdir, ".buildinfo")) as fp:
+                buildinfo = BuildInfo.load(fp)
+
+            if self.build_info != buildinfo:
+                yield from self.env.found_docs
+                return
+        except ValueError as exc:
+            logger.warning(__("Failed to read build info file: %r"), exc)
+        except OSError:
+            pass
+
+        if self.templates:
+            template_mtime = self.templates.newest_template_mtime()
+        else:
+            template_mtime = 0
+
+        for docname in self.env.found_docs:
+            if docname not in self.env.all_docs:
+                yield docname
+                continue
+
+            try:
+                targetmtime = max(
+                    path.getmtime(self.get_outfilename(docname)),
+                    self.rendered.get(docname, 0),
+                )
+            except OSError:
+                yield docname
+                continue
+
+            try:
+                srcmtime = max(
+                    path.getmtime(self.env.doc2path(docname)), template_mtime
+                )
+            except OSError:
+                continue
+
+            if srcmtime > targetmtime:
+                yield docname
+
+    def finish(self) -> None:
+        super().finish()
+
+        self.rendered = {
+            docname: rendered
+            for docname, rendered in self.rendered.items()
+            if docname in self.env.all_docs
+        }
+        with open(self.rendered_path, "wb") as f:
+            pickle.dump(self.rendered, f, pickle.HIGHEST_PROTOCOL)
+
+        self.deck_plugins = {
+            docname: names
+            for docname, names in self.deck_plugins.items()
+            if docname in self.env.all_docs
+        }
+        with open(self.deck_plugins_path, "wb") as f:
+            pickle.dump(self.deck_plugins, f, pickle.HIGHEST_PROTOCOL)
+
+        if not self.config.revealjs_multiplex_master:
+            # Master pages hold the secret, so don't leave old ones behind.
+            for relpath in self.master_pages.values():
+                filename = path.join(self.outdir, relpath)
+                if path.isfile(filename):
+                    os.remove(filename)
+            self.master_pages = {}
+        with open(self.master_pages_path, "wb") as f:
+            pickle.dump(self.master_pages, f, pickle.HIGHEST_PROTOCOL)
+
+        if self.config.revealjs_service_worker:
+            self.deck_files = {
+                docname: files
+                for docname, files in self.deck_files.items()
+                if docname in self.env.all_docs
+            }
+            with open(self.deck_files_path, "wb") as f:
+                pickle.dump(self.deck_files, f, pickle.HIGHEST_PROTOCOL)
+
+        if self.config.revealjs_critical_css:
+            # Only keep entries used by this build, so the cache doesn't grow.
+            with open(self.critical_css_path, "wb") as f:
+                pickle.dump(self.critical_css_used, f, pickle.HIGHEST_PROTOCOL)
+
+        if self.pruned:
+            logger.info(
+                "pruned %d nodes (%d bytes) from %d documents",
+                sum(count for count, _ in self.pruned.values()),
+                sum(size for _, size in self.pruned.values()),
+                len(self.pruned),
+            )
+
+    @property
+    def rendered_path(self) -> str:
+        return path.join(self.doctreedir, "revealjs-rendered.pickle")
+
+    @property
+    def deck_plugins_path(self) -> str:
+        return path.join(self.doctreedir, "revealjs-plugins.pickle")
+
+    @property
+    def master_pages_path(self) -> str:
+        return path.join(self.doctreedir, "revealjs-master-pages.pickle")
+
+    @property
+    def deck_files_path(self) -> str:
+        return path.join(self.doctreedir, "revealjs-deck-files.pickle")
+
+    @property
+    def critical_css_path(self) -> str:
+        return path.join(self.doctreedir, "revealjs-critical-css.pickle")
+
+    def read_stylesheet(self, filename: str) -> Optional[str]:
+        """Return the source of a stylesheet linked by pages, if it's local.
+
+        ``filename`` is the stylesheet's path in the output directory. Static
+        files are copied after pages are written, so look for the source file
+        instead.
+        """
+
+        if filename in self.stylesheets:
+            return self.stylesheets[filename]
+
+        static_dir, _, name = filename.partition("/")
+        _, theme_opts = self.get_theme_config()
+
+        css = None
+        if static_dir != "_static" or "://" in filename:
+            pass
+        elif name == "pygments.css":
+            css = self.highlighter.get_stylesheet()
+        else:
+            candidates = [path.join(self.revealjs_dist, name)]
+            if name == theme_opts.get("revealjs_theme"):
+                candidates.insert(
+                    0, path.join(self.revealjs_dist, "theme", name)
+                )
+            candidates += [
+                path.join(self.confdir, static_path, name)
+                for static_path in self.config.html_static_path
+            ]
+            if self.theme:
+                candidates += [
+                    path.join(theme_dir, "static", name)
+                    for theme_dir in self.theme.get_theme_dirs()
+                ]
+
+            for candidate in candidates:
+                if path.isfile(candidate):
+                    with open(candidate, encoding="utf-8") as f:
+                        css = f.read()
+                    break
+
+        self.stylesheets[filename] = css
+        return css
+
+    def get_critical_css(
+        self,
+        body: str,
+        css_files: List[Tuple[int, str]],
+        pathto: Callable[..., str],
+    ) -> str:
+        """Return the CSS needed to render a deck's opening slides.
+
+        ``css_files`` are the ``(priority, filename)`` of the page's
+        stylesheets. Results are cached by the opening slides' markup and the
+        contents of the stylesheets, so they're only recomputed when either
+        changes.
+        """
+
+        # Sorted like Sphinx sorts the page's stylesheets.
+        filenames = ["_static/pygments.css"] + [
+            filename
+            for _, filename in sorted(css_files, key=lambda css: css[0])
+        ]
+        stylesheets = [
+            (filename, css)
+            for filename, css in (
+                (filename, self.read_stylesheet(filename))
+                for filename in filenames
+            )
+            if css is not None
+        ]
+
+        soup = opening_slides(body, self.config.revealjs_critical_css_slides)
+
+        key = hashlib.sha256()
+        key.update(pathto("_static/", 1).encode())
+        key.update(str(soup).encode())
+        for filename, css in stylesheets:
+            key.update(filename.encode())
+            key.update(css.encode())
+        digest = key.hexdigest()
+
+        if digest not in self.critical_css:
+            self.critical_css[digest] = extract_critical_css(
+                soup, stylesheets, pathto
+            )
+
+        self.critical_css_used[digest] = self.critical_css[digest]
+        return self.critical_css[digest]
+
+    def update_page_context(
+        self,
+        pagename: str,
+        templatename: str,
+        ctx: Dict[str, Any],
+        event_arg: Any,
+    ) -> None:
+        super().update_page_context(pagename, templatename, ctx, event_arg)
+
+        # script_files and css_files are reset for every page, so these are
+        # only loaded by this deck.
+        plugins = self.get_deck_plugins(pagename)
+        for plugin in plugins:
+            for stylesheet in plugin.stylesheets:
+                self.add_css_file(
+                    f"plugin/{plugin.name}/{stylesheet}", priority=500
+                )
+            for script in plugin.scripts:
+                self.add_js_file(
+                    f"plugin/{plugin.name}/{script}", priority=500
+                )
+        self.add_js_file(None, body=initialize_script(plugins), priority=500)
+
+        if self.config.revealjs_critical_css and "body" in ctx:
+            if pagename in self.deck_critical_css:
+                ctx["critical_css"] = self.deck_critical_css[pagename]
+            else:
+                ctx["critical_css"] = self.get_critical_css(
+                    ctx["body"],
+                    [(css.priority, css.filename) for css in ctx["css_files"]],
+                    ctx["pathto"],
+                )
+
+        ctx["revealjs_service_worker"] = self.config.revealjs_service_worker
 
     def get_theme_config(self) -> Tuple[str, Dict]:
         """Override get_theme_config to return the theme config for RevealJS."""
@@ -107,25 +473,258 @@ class RevealJSBuilder(StandaloneHTMLBuilder):
             self.config.revealjs_theme_options,
         )
 
+    def get_theme_assets(self) -> List[str]:
+        """Return absolute paths of RevealJS theme files used by every deck."""
+
+        if not self.theme:
+            return []
+
+        _, theme_opts = self.get_theme_config()
+        return [
+            path.join(
+                self.revealjs_dist, "theme", theme_opts["revealjs_theme"]
+            )
+        ]
+
+    def write_doc_serialized(
+        self, docname: str, doctree: nodes.document
+    ) -> None:
+        super().write_doc_serialized(docname, doctree)
+
+        # Recorded here rather than when the page is written, since pages
+        # are written in worker processes with -j.
+        self.rendered[docname] = time.time()
+
+        # Slide directives only run when a document is read, so register
+        # their images from the environment as well.
+        for image in get_slide_images(self.env, docname):
+            self.images[image] = image
+
+        self.deck_plugins[docname] = find_used_plugins(self.plugins, doctree)
+
+        if self.config.revealjs_service_worker:
+            self.deck_files[docname] = self.get_deck_files(docname, doctree)
+
+        if self.config.revealjs_critical_css:
+            self.deck_critical_css[docname] = self.render_critical_css(
+                docname, doctree
+            )
+
+    def render_critical_css(
+        self, docname: str, doctree: nodes.document
+    ) -> str:
+        """Render a deck's body and return its critical CSS.
+
+        Called from ``write_doc_serialized``, which runs in the main process
+        even with -j, so the cache gets every deck's entry. Worker processes
+        are started afterwards and look the result up when writing the page.
+        """
+
+        # Set up like write_doc() does.
+        destination = StringOutput(encoding="utf-8")
+        doctree.settings = self.docsettings
+        self.secnumbers = self.env.toc_secnumbers.get(docname, {})
+        self.fignumbers = self.env.toc_fignumbers.get(docname, {})
+        self.dlpath = relative_uri(self.get_target_uri(docname), "_downloads")
+        self.current_docname = docname
+        self.docwriter.write(doctree, destination)
+        self.docwriter.assemble_parts()
+
+        css_files = [(css.priority, css.filename) for css in self._css_files]
+        for plugin in self.get_deck_plugins(docname):
+            css_files += [
+                (500, f"_static/plugin/{plugin.name}/{stylesheet}")
+                for stylesheet in plugin.stylesheets
+            ]
+
+        baseuri = self.get_target_uri(docname)
+
+        def pathto(otheruri: str, resource: bool = False) -> str:
+            if resource and "://" in otheruri:
+                return otheruri
+            if not resource:
+                otheruri = self.get_target_uri(otheruri)
+            return relative_uri(baseuri, otheruri) or "#"
+
+        return self.get_critical_css(
+            self.docwriter.parts["fragment"], css_files, pathto
+        )
+
+    def get_deck_files(
+        self, docname: str, doctree: nodes.document
+    ) -> List[str]:
+        """Return the output files a deck uses, other than shared ones.
+
+        These are the deck's page, its plugins' scripts and stylesheets and
+        its images, relative to the output directory. Static files outside
+        ``_static/plugin`` are shared by every deck.
+        """
+
+        page = path.relpath(self.get_outfilename(docname), self.outdir)
+        files = {page.replace(path.sep, "/")}
+
+        for plugin in self.get_deck_plugins(docname):
+            files.update(
+                f"_static/plugin/{plugin.name}/{filename}"
+                for filename in plugin.scripts + plugin.stylesheets
+            )
+        if self.config.revealjs_telemetry:
+            files.add("_static/plugin/telemetry/telemetry.js")
+
+        # post_process_images() has mapped the deck's images to their
+        # output names.
+        for node in doctree.traverse(nodes.image):
+            if node["uri"] in self.images:
+                files.add(f"{self.imagedir}/{self.images[node['uri']]}")
+        for image in get_slide_images(self.env, docname):
+            files.add(f"{self.imagedir}/{self.images[image]}")
+        # Remote background images vendored by
+        # transforms.vendor_remote_assets aren't image nodes, but they're
+        # registered as the deck's images.
+        for image, (docnames, _) in self.env.images.items():
+            if docname in docnames and image in self.images:
+                files.add(f"{self.imagedir}/{self.images[image]}")
+
+        return sorted(files)
+
+    def get_deck_plugins(self, pagename: str) -> List[RevealJSPlugin]:
+        """Return the plugins loaded by ``pagename``.
+
+        Pages that aren't decks, like the index, only load plugins that
+        every deck loads.
+        """
+
+        if pagename in self.deck_plugins:
+            used = set(self.deck_plugins[pagename])
+            return [plugin for plugin in self.plugins if plugin.name in used]
+
+        return [plugin for plugin in self.plugins if not plugin.used_by]
+
+    @property
+    def multiplex(self) -> Dict[str, str]:
+        """Return ``revealjs_multiplex`` with its id filled in, if enabled."""
+
+        # Imported here so ``python -m sphinxcontrib.revealjs.multiplex``
+        # doesn't import the module twice.
+        from .multiplex import socket_id
+
+        multiplex = dict(self.config.revealjs_multiplex or {})
+        if multiplex.get("secret") and not multiplex.get("id"):
+            multiplex["id"] = socket_id(multiplex["secret"])
+
+        if not (multiplex.get("url") and multiplex.get("id")):
+            return {}
+
+        return multiplex
+
+    def handle_page(
+        self,
+        pagename: str,
+        addctx: Dict,
+        templatename: str = "page.html",
+        outfilename: Optional[str] = None,
+        event_arg: Any = None,
+    ) -> None:
+        try:
+            self.write_page_variants(
+                pagename, addctx, templatename, outfilename, event_arg
+            )
+        finally:
+            # Drop the page's plugins, or prepare_writing() would keep the
+            # last page's plugins for every page of the next build.
+            self.script_files[:] = self._script_files
+            self.css_files[:] = self._css_files
+
+    def write_page_variants(
+        self,
+        pagename: str,
+        addctx: Dict,
+        templatename: str,
+        outfilename: Optional[str],
+        event_arg: Any,
+    ) -> None:
+        """Write the page, plus its master variant if multiplex is enabled.
+
+        Followers get the deck's multiplex url and id; the master variant
+        (``<page>-master.html``) also gets the secret, so it can broadcast.
+        Master variants are only written when ``revealjs_multiplex_master``
+        is set, and are recorded in ``master_pages``.
+        """
+
+        multiplex = self.multiplex
+        if not multiplex or pagename not in self.env.all_docs:
+            self.write_page(
+                pagename, addctx, templatename, outfilename, event_arg
+            )
+            return
+
+        follower = {"url": multiplex["url"], "id": multiplex["id"]}
+        self.write_page(
+            pagename,
+            dict(addctx, revealjs_multiplex=follower),
+            templatename,
+            outfilename,
+            event_arg,
+        )
+
+        if multiplex.get("secret") and self.config.revealjs_multiplex_master:
+            outfilename = outfilename or self.get_outfilename(pagename)
+            master = path.splitext(outfilename)[0] + MASTER_SUFFIX
+            self.master_pages[pagename] = path.relpath(
+                master + self.out_suffix, self.outdir
+            ).replace(os.sep, "/")
+            self.write_page(
+                pagename,
+                dict(
+                    addctx,
+                    revealjs_multiplex=dict(
+                        follower, secret=multiplex["secret"]
+                    ),
+                ),
+                templatename,
+                master + self.out_suffix,
+                event_arg,
+            )
+
+    def write_page(
+        self,
+        pagename: str,
+        addctx: Dict,
+        templatename: str,
+        outfilename: Optional[str],
+        event_arg: Any,
+    ) -> None:
+        """Render a page, and only replace its file if the output changed."""
+
+        outfilename = outfilename or self.get_outfilename(pagename)
+        tmpfilename = outfilename + ".tmp"
+
+        super().handle_page(
+            pagename, addctx, templatename, tmpfilename, event_arg
+        )
+
+        if path.exists(tmpfilename):
+            replace_if_changed(tmpfilename, outfilename)
+
     def init_js_files(self) -> None:
-        """Register names of RevealJS JS dependencies."""
+        """Register names of RevealJS JS dependencies.
+
+        Plugins and the ``Reveal.initialize`` call depend on the deck, so
+        they're added by ``update_page_context``.
+        """
 
         super().init_js_files()
 
         self.add_js_file("reveal.js", priority=500)
-        self.add_js_file("plugin/notes/notes.js", priority=500)
-        self.add_js_file(
-            None,
-            body=dedent(
-                """
-                Reveal.initialize({
-                  hash: true,
-                  plugins: [RevealNotes]
-                });
-            """
-            ),
-            priority=500,
-        )
+
+        if self.config.revealjs_telemetry:
+            # Reveal.on() calls made before Reveal.initialize() are queued,
+            # so the script can be loaded before the per-deck initialize.
+            self.add_js_file(
+                "plugin/telemetry/telemetry.js",
+                priority=500,
+                **{"data-endpoint": self.config.revealjs_telemetry},
+            )
 
     def init_css_files(self) -> None:
         """Register names of RevealJS CSS dependencies.
@@ -142,6 +741,47 @@ class RevealJSBuilder(StandaloneHTMLBuilder):
             _, theme_opts = self.get_theme_config()
             self.add_css_file(theme_opts["revealjs_theme"], priority=500)
 
+    def create_pygments_style_file(self) -> None:
+        write_if_changed(
+            path.join(self.outdir, "_static", "pygments.css"),
+            self.highlighter.get_stylesheet(),
+        )
+
+        if self.dark_highlighter:
+            write_if_changed(
+                path.join(self.outdir, "_static", "pygments_dark.css"),
+                self.dark_highlighter.get_stylesheet(),
+            )
+
+    def write_buildinfo(self) -> None:
+        buildinfo = io.StringIO()
+        self.build_info.dump(buildinfo)
+
+        try:
+            write_if_changed(
+                path.join(self.outdir, ".buildinfo"), buildinfo.getvalue()
+            )
+        except OSError as err:
+            logger.warning("cannot write build info file %r", err)
+
+    def dump_inventory(self) -> None:
+        filename = path.join(self.outdir, INVENTORY_FILENAME)
+        InventoryFile.dump(filename + ".tmp", self.env, self)
+        replace_if_changed(filename + ".tmp", filename)
+
+    def copy_image_files(self) -> None:
+        """Copy images, including slide images in subdirectories.
+
+        Images that haven't changed since they were last copied are skipped.
+        """
+
+        for dest in self.images.values():
+            ensuredir(
+                path.join(self.outdir, self.imagedir, path.dirname(dest))
+            )
+
+        super().copy_image_files()
+
     def copy_static_files(self) -> None:
         """Copy RevealJS static files to the output directory."""
 
@@ -149,7 +789,8 @@ class RevealJSBuilder(StandaloneHTMLBuilder):
             with progress_message("copying static files"):
                 ensuredir(path.join(self.outdir, "_static"))
                 self.copy_revealjs_files()
-                self.copy_revealjs_plugin()
+                self.copy_revealjs_plugins()
+                self.copy_telemetry_script()
                 self.copy_revealjs_theme()
         except OSError as err:
             logger.warning("cannot copy static file %r", err)
@@ -170,11 +811,26 @@ class RevealJSBuilder(StandaloneHTMLBuilder):
             path.join(self.outdir, "_static", "reveal.js"),
         )
 
-    def copy_revealjs_plugin(self) -> None:
-        copy_asset(
-            path.join(self.revealjs_plugindir, "notes"),
-            path.join(self.outdir, "_static", "plugin", "notes"),
-        )
+    def copy_revealjs_plugins(self) -> None:
+        """Copy the plugins used by at least one deck."""
+
+        used = set()
+        for names in self.deck_plugins.values():
+            used.update(names)
+
+        for plugin in self.plugins:
+            if plugin.name in used or not plugin.used_by:
+                copy_asset(
+                    plugin.source,
+                    path.join(self.outdir, "_static", "plugin", plugin.name),
+                )
+
+    def copy_telemetry_script(self) -> None:
+        if self.config.revealjs_telemetry:
+            copy_asset(
+                path.join(package_dir, "plugin", "telemetry"),
+                path.join(self.outdir, "_static", "plugin", "telemetry"),
+            )
 
     def copy_revealjs_theme(self) -> None:
         if self.theme:
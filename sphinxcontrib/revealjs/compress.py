@@ -0,0 +1,202 @@
+"""sphinxcontrib.revealjs.compress
+
+Write precompressed ``.gz`` (and ``.br``, if ``brotli`` is installed)
+sidecars next to text files in the output directory, for static hosts that
+serve them when they exist.
+
+Files are compressed in a process pool. Files whose content hasn't changed
+since the last build, and whose sidecars still exist, are skipped. Sidecars
+of files that were compressed by the last build but are gone now are
+removed, so hosts don't keep serving deleted pages.
+
+Contents:
+    - sidecar_formats
+    - compress_file
+    - find_outdated
+    - remove_stale_sidecars
+    - write_sidecars
+"""
+
+from typing import Collection, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from os import path
+
+import gzip
+import hashlib
+import os
+import pickle
+
+from sphinx.application import Sphinx
+from sphinx.util import logging, progress_message
+
+from .builder import RevealJSBuilder
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+#: Suffixes of files that are worth compressing.
+TEXT_SUFFIXES = (
+    ".html",
+    ".js",
+    ".mjs",
+    ".css",
+    ".svg",
+    ".json",
+    ".txt",
+    ".xml",
+    ".map",
+)
+
+#: path relative to the output directory -> (size, mtime_ns, sha256)
+HashCache = Dict[str, Tuple[int, int, str]]
+
+
+def sidecar_formats() -> List[str]:
+    """Return the sidecar suffixes that can be written."""
+
+    return [".gz", ".br"] if brotli else [".gz"]
+
+
+def compress_file(filename: str) -> None:
+    """Write compressed sidecars of ``filename``.
+
+    Sidecars get the same modification time as ``filename``, and gzip
+    headers don't include a timestamp, so the output is reproducible.
+    """
+
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    stat = os.stat(filename)
+    for suffix in sidecar_formats():
+        if suffix == ".gz":
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            compressed = brotli.compress(data, quality=11)
+
+        with open(filename + suffix, "wb") as f:
+            f.write(compressed)
+        os.utime(filename + suffix, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def _content_hash(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def find_outdated(
+    outdir: str, previous: HashCache, exclude: Collection[str] = ()
+) -> Tuple[List[str], HashCache]:
+    """Return text files in ``outdir`` that need compressing.
+
+    Also returns the hash cache for this build. Files with the same size and
+    modification time as before aren't hashed again. Files in ``exclude``,
+    relative to ``outdir``, are skipped.
+    """
+
+    hashes: HashCache = {}
+    outdated = []
+    formats = sidecar_formats()
+
+    for dirpath, dirnames, filenames in os.walk(outdir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+
+        for filename in filenames:
+            if not filename.endswith(TEXT_SUFFIXES):
+                continue
+
+            fullpath = path.join(dirpath, filename)
+            relpath = path.relpath(fullpath, outdir).replace(os.sep, "/")
+            if relpath in exclude:
+                continue
+
+            stat = os.stat(fullpath)
+            cached = previous.get(relpath)
+
+            if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+                digest = cached[2]
+            else:
+                digest = _content_hash(fullpath)
+
+            hashes[relpath] = (stat.st_size, stat.st_mtime_ns, digest)
+
+            if (
+                cached is None
+                or cached[2] != digest
+                or not all(path.exists(fullpath + fmt) for fmt in formats)
+            ):
+                outdated.append(fullpath)
+
+    return outdated, hashes
+
+
+def remove_stale_sidecars(
+    outdir: str, previous: HashCache, hashes: HashCache
+) -> List[str]:
+    """Remove sidecars of files the last build compressed but this one didn't.
+
+    That's files that were removed, or that aren't compressed anymore.
+    Returns the removed sidecars.
+    """
+
+    removed = []
+    for relpath in sorted(set(previous) - set(hashes)):
+        for suffix in (".gz", ".br"):
+            sidecar = path.join(outdir, relpath + suffix)
+            if path.isfile(sidecar):
+                os.remove(sidecar)
+                removed.append(sidecar)
+
+    return removed
+
+
+def write_sidecars(app: Sphinx, exception: Optional[Exception]) -> None:
+    """Compress changed text files after pages and static files are written."""
+
+    if (
+        exception
+        or not isinstance(app.builder, RevealJSBuilder)
+        or not app.config.revealjs_precompress
+    ):
+        return
+
+    cache_path = path.join(app.doctreedir, "revealjs-precompress.pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            previous = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        previous = {}
+
+    # Master pages hold the multiplex secret, so they aren't compressed.
+    outdated, hashes = find_outdated(
+        app.outdir, previous, set(app.builder.master_pages.values())
+    )
+    removed = remove_stale_sidecars(app.outdir, previous, hashes)
+
+    if outdated:
+        with progress_message(
+            f"compressing {len(outdated)} files "
+            f"({', '.join(sidecar_formats())})"
+        ):
+            workers = app.parallel if app.parallel > 1 else None
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Consume the results so errors are raised here.
+                list(executor.map(compress_file, outdated, chunksize=16))
+
+    with open(cache_path, "wb") as f:
+        pickle.dump(hashes, f, pickle.HIGHEST_PROTOCOL)
+
+    logger.info(
+        "precompressed %d files (%d unchanged), removed %d stale sidecars",
+        len(outdated),
+        len(hashes) - len(outdated),
+        len(removed),
+    )
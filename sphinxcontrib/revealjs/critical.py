@@ -0,0 +1,189 @@
+"""sphinxcontrib.revealjs.critical
+
+Extract the CSS needed to render the first slides of a deck, so it can be
+inlined into the page while the full stylesheets load asynchronously.
+
+Contents:
+    - split_statements
+    - opening_slides
+    - extract_critical_css
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import posixpath
+import re
+
+from bs4 import BeautifulSoup
+from soupsieve import SelectorSyntaxError
+
+#: Elements RevealJS adds to the page when it starts.
+RUNTIME_SKELETON = """
+<html class="reveal-full-page">
+  <body class="reveal-viewport">
+    <div class="reveal slide center has-horizontal-slides ready">
+      <div class="slides"></div>
+      <div class="backgrounds"></div>
+      <div class="progress"><span></span></div>
+      <aside class="controls">
+        <button class="navigate-left"></button>
+        <button class="navigate-right"></button>
+        <button class="navigate-up"></button>
+        <button class="navigate-down"></button>
+        <div class="controls-arrow"></div>
+      </aside>
+      <div class="slide-number"></div>
+      <div class="speaker-notes"></div>
+      <div class="pause-overlay"></div>
+      <div class="aria-status"></div>
+    </div>
+  </body>
+</html>
+"""
+
+#: At-rules whose blocks contain style rules.
+GROUPING_AT_RULES = ("@media", "@supports", "@layer")
+
+#: At-rules that are kept whole.
+KEPT_AT_RULES = ("@font-face",)
+
+COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+# Pseudo-classes and pseudo-elements that depend on user interaction or don't
+# select elements. Selectors are matched without them.
+DYNAMIC_PSEUDO = re.compile(
+    r"::?(?:before|after|first-letter|first-line|selection|placeholder|marker"
+    r"|backdrop|hover|focus|focus-within|focus-visible|active|visited|link"
+    r"|-webkit-[\w-]+|-moz-[\w-]+|-ms-[\w-]+)(?![\w-])"
+)
+
+
+def split_statements(css: str) -> List[Tuple[str, Optional[str]]]:
+    """Split ``css`` into top-level ``(prelude, block)`` statements.
+
+    ``block`` is ``None`` for statements without one, like ``@import``.
+    """
+
+    css = COMMENT.sub("", css)
+    statements: List[Tuple[str, Optional[str]]] = []
+
+    depth = 0
+    quote = None
+    start = block_start = 0
+    for i, char in enumerate(css):
+        if quote:
+            if char == quote and css[i - 1] != "\\":
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "{":
+            if depth == 0:
+                block_start = i
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                statements.append(
+                    (
+                        css[start:block_start].strip(),
+                        css[block_start + 1 : i].strip(),
+                    )
+                )
+                start = i + 1
+        elif char == ";" and depth == 0:
+            statements.append((css[start:i].strip(), None))
+            start = i + 1
+
+    return [stmt for stmt in statements if stmt[0] or stmt[1]]
+
+
+def opening_slides(body: str, count: int) -> BeautifulSoup:
+    """Return the RevealJS page skeleton containing the first slides.
+
+    The title slide and the ``count`` slides after it, in document order,
+    are kept; the rest are removed.
+    """
+
+    soup = BeautifulSoup(RUNTIME_SKELETON, "html.parser")
+    slides = BeautifulSoup(body, "html.parser")
+
+    for i, section in enumerate(slides.find_all("section")):
+        if i > count and not section.decomposed:
+            section.decompose()
+        elif i == 0:
+            section["class"] = section.get("class", []) + ["present"]
+
+    soup.find(class_="slides").append(slides)
+    return soup
+
+
+def _selector_matches(soup: BeautifulSoup, selector: str) -> bool:
+    selector = DYNAMIC_PSEUDO.sub("", selector).strip()
+    if not selector or selector in ("*", ":root", "html", "body"):
+        return True
+
+    try:
+        return soup.select_one(selector) is not None
+    except (SelectorSyntaxError, NotImplementedError, ValueError):
+        # Keep rules we can't check.
+        return True
+
+
+def _critical_statements(
+    soup: BeautifulSoup, css: str, rebase_url: Callable[[str], str]
+) -> List[str]:
+    kept = []
+
+    for prelude, block in split_statements(css):
+        at_rule = prelude.split(None, 1)[0].lower() if prelude else ""
+
+        if block is None:
+            # @import and @charset don't affect the opening slides; the full
+            # stylesheets still load them.
+            continue
+        elif at_rule.startswith(GROUPING_AT_RULES):
+            inner = _critical_statements(soup, block, rebase_url)
+            if inner:
+                kept.append(f"{prelude}{{{''.join(inner)}}}")
+        elif at_rule.startswith(KEPT_AT_RULES):
+            kept.append(f"{prelude}{{{URL.sub(rebase_url, block)}}}")
+        elif at_rule.startswith("@"):
+            continue
+        elif any(
+            _selector_matches(soup, selector)
+            for selector in prelude.split(",")
+        ):
+            kept.append(f"{prelude}{{{URL.sub(rebase_url, block)}}}")
+
+    return kept
+
+
+def extract_critical_css(
+    soup: BeautifulSoup,
+    stylesheets: List[Tuple[str, str]],
+    pathto: Callable[..., str],
+) -> str:
+    """Return the CSS rules in ``stylesheets`` that apply to ``soup``.
+
+    ``stylesheets`` is a list of ``(filename, css)`` where ``filename`` is
+    the stylesheet's path in the output directory. Relative ``url()`` values
+    are rewritten so they resolve from the page instead of the stylesheet.
+    """
+
+    rules = []
+
+    for filename, css in stylesheets:
+        base = posixpath.dirname(filename)
+
+        def rebase_url(match: re.Match) -> str:
+            url = match.group(2).strip()
+            if url.startswith(("data:", "#", "/")) or "://" in url:
+                return match.group(0)
+
+            url = posixpath.normpath(posixpath.join(base, url))
+            return f'url("{pathto(url, 1)}")'
+
+        rules += _critical_statements(soup, css, rebase_url)
+
+    return "\n".join(rules)
@@ -0,0 +1,610 @@
+"""Generate slide decks from data instead of reST.
+
+Decks generated from data (metrics reviews, per-team reports...) don't need
+to be templated into reST and parsed again. Decks written as ``.deck.json``
+or ``.deck.yaml`` files are turned into final slide doctrees directly:
+sections, speaker notes, interslides and fragments are built as nodes, so
+the reST parser and the newslide passes are skipped.
+
+A deck looks like this (as YAML)::
+
+    title: Metrics review
+    slides:
+      - title: Latency
+        background-color: "#002b36"
+        content:
+          - p99 latency went down this week.
+          - bullets: [API, Workers, Database]
+            incremental: item
+          - code: print("hello")
+            language: python
+          - fragment: Shown on the next step.
+        notes: Mention the cache rollout.
+        slides:
+          - title: Latency by region
+            content:
+              - image: charts/latency.svg
+
+Content blocks are strings (paragraphs) or dicts with one of ``text``,
+``bullets``, ``code``, ``math``, ``image``, ``raw``, ``notes``,
+``fragment`` or ``interslide``. Text isn't parsed as reST.
+
+YAML decks require PyYAML (``pip install sphinxcontrib-revealjs[decks]``).
+
+Usage::
+
+    $ python -m sphinxcontrib.revealjs.decks rst index.deck.yaml
+    $ python -m sphinxcontrib.revealjs.decks benchmark --slides 2000
+
+Contents:
+    - DeckError
+    - make_blocks
+    - make_speakernote
+    - make_interslide
+    - make_slide
+    - build_deck
+    - load_deck
+    - DeckParser
+    - deck_to_rst
+    - benchmark
+"""
+
+from typing import Any, Dict, List, Optional
+from os import path
+from textwrap import indent
+
+import argparse
+import io
+import json
+import os
+import re
+import tempfile
+import time
+
+from docutils import nodes
+from docutils.parsers.rst import directives
+from sphinx.environment import BuildEnvironment
+from sphinx.parsers import Parser
+from sphinx.util import logging
+
+from . import addnodes
+from .directives.slides import BaseSlide, set_slide_options
+from .transforms import set_slide_id
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+#: Suffixes of deck files, registered as source suffixes.
+DECK_SUFFIXES = (".deck.json", ".deck.yaml", ".deck.yml")
+
+SLIDE_OPTIONS = tuple(BaseSlide.option_spec)
+INCREMENTAL_MODES = ("one", "item", "nest")
+
+
+class DeckError(ValueError):
+    """A deck's data is invalid."""
+
+
+def _slide_options(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a slide's options like the slide directives do."""
+
+    options = {}
+    for name in SLIDE_OPTIONS:
+        if name not in spec:
+            continue
+
+        value = spec[name]
+        if name == "class" and isinstance(value, list):
+            value = " ".join(value)
+
+        try:
+            options[name] = BaseSlide.option_spec[name](str(value))
+        except ValueError as err:
+            raise DeckError(f"invalid {name} {value!r}: {err}") from err
+
+    return options
+
+
+def _set_options(
+    node: nodes.Element,
+    spec: Dict[str, Any],
+    env: Optional[BuildEnvironment],
+) -> None:
+    options = _slide_options(spec)
+    background = options.get("background-image", "")
+    if env is None and background and "://" not in background:
+        raise DeckError(
+            f"local background image {background!r} needs a build "
+            "environment"
+        )
+
+    set_slide_options(node, options, env)
+
+
+def _paragraph(text: Any) -> nodes.paragraph:
+    text = str(text)
+    return nodes.paragraph(text, text)
+
+
+def _bullet_list(
+    spec: Dict[str, Any], env: Optional[BuildEnvironment]
+) -> nodes.Element:
+    items = spec["bullets"]
+    if not isinstance(items, list):
+        raise DeckError(f"bullets must be a list, not {items!r}")
+
+    if spec.get("enumerated"):
+        node = nodes.enumerated_list(enumtype="arabic", prefix="", suffix=".")
+    else:
+        node = nodes.bullet_list(bullet="-")
+
+    for item in items:
+        node += nodes.list_item("", *make_blocks(item, env))
+
+    mode = spec.get("incremental")
+    if mode is None:
+        return node
+    if mode not in INCREMENTAL_MODES:
+        raise DeckError(
+            f"incremental must be one of {INCREMENTAL_MODES}, not {mode!r}"
+        )
+
+    # Mark fragments like the incremental directive does.
+    if mode == "one":
+        return nodes.container("", node, classes=["fragment"])
+
+    node["incremental"] = mode
+    if mode == "item":
+        for list_item in node.children:
+            list_item["classes"].append("fragment")
+    else:
+        for list_item in node.traverse(nodes.list_item):
+            list_item["classes"].append("fragment")
+
+    return node
+
+
+def _block(
+    spec: Dict[str, Any], env: Optional[BuildEnvironment]
+) -> List[nodes.Node]:
+    if "text" in spec:
+        node = _paragraph(spec["text"])
+    elif "bullets" in spec:
+        node = _bullet_list(spec, env)
+    elif "code" in spec:
+        code = str(spec["code"])
+        node = nodes.literal_block(code, code)
+        if spec.get("language"):
+            node["language"] = spec["language"]
+    elif "math" in spec:
+        latex = str(spec["math"])
+        node = nodes.math_block(
+            latex,
+            latex,
+            docname=env.docname if env else None,
+            number=None,
+            label=None,
+            nowrap=False,
+        )
+    elif "image" in spec:
+        node = nodes.image(uri=spec["image"])
+        for name in ("alt", "width", "height"):
+            if name in spec:
+                node[name] = str(spec[name])
+    elif "raw" in spec:
+        html = str(spec["raw"])
+        node = nodes.raw(html, html, format="html")
+    elif "notes" in spec:
+        node = make_speakernote(spec["notes"], env)
+    elif "fragment" in spec:
+        # Like ``.. incr:: one``
+        node = nodes.container(
+            "", *make_blocks(spec["fragment"], env), classes=["fragment"]
+        )
+    elif "interslide" in spec:
+        node = make_interslide(spec, env)
+    else:
+        raise DeckError(f"unknown content block {spec!r}")
+
+    if "class" in spec and "interslide" not in spec:
+        node["classes"] += directives.class_option(str(spec["class"]))
+
+    return [node]
+
+
+def make_blocks(
+    spec: Any, env: Optional[BuildEnvironment] = None
+) -> List[nodes.Node]:
+    """Return the nodes of a content block, or a list of blocks."""
+
+    if isinstance(spec, list):
+        return [node for block in spec for node in make_blocks(block, env)]
+    if isinstance(spec, dict):
+        return _block(spec, env)
+
+    return [_paragraph(spec)]
+
+
+def make_speakernote(
+    spec: Any, env: Optional[BuildEnvironment] = None
+) -> addnodes.speakernote:
+    """Return speaker notes made of the content blocks ``spec``."""
+
+    return addnodes.speakernote("", *make_blocks(spec, env), classes=["notes"])
+
+
+def make_interslide(
+    spec: Dict[str, Any], env: Optional[BuildEnvironment] = None
+) -> addnodes.interslide:
+    """Return an interslide with the content blocks in ``spec["interslide"]``.
+
+    Slide options like ``background-color`` are read from ``spec`` too.
+    """
+
+    node = addnodes.interslide(
+        "", *make_blocks(spec["interslide"], env), classes=["interslide"]
+    )
+    _set_options(node, spec, env)
+    return node
+
+
+def make_slide(
+    spec: Dict[str, Any],
+    env: Optional[BuildEnvironment] = None,
+    vertical: bool = False,
+) -> nodes.section:
+    """Return the section of a slide and its vertical ``slides``.
+
+    ``vertical`` slides can't have slides of their own.
+    """
+
+    if not isinstance(spec, dict) or "title" not in spec:
+        raise DeckError(f"slides must have a title: {spec!r}")
+
+    title = str(spec["title"])
+    section = nodes.section("", nodes.title(title, title))
+    if spec.get("id"):
+        section["ids"].append(str(spec["id"]))
+
+    _set_options(section, spec, env)
+    section.extend(make_blocks(spec.get("content", []), env))
+
+    if "notes" in spec:
+        section += make_speakernote(spec["notes"], env)
+
+    if spec.get("slides"):
+        if vertical:
+            raise DeckError(f"slide {title!r} is nested too deeply")
+        for subslide in spec["slides"]:
+            section += make_slide(subslide, env, vertical=True)
+
+    return section
+
+
+def _note_section(document: nodes.document, section: nodes.section) -> None:
+    """Name the section after its title, like the reST parser does.
+
+    Sections whose titles are already taken get an id derived from their
+    contents, instead of a numbered one.
+    """
+
+    name = nodes.fully_normalize_name(section[0].astext())
+    section["names"].append(name)
+
+    if not section["ids"]:
+        slide_id = nodes.make_id(name)
+        if slide_id and slide_id not in document.ids:
+            section["ids"].append(slide_id)
+        else:
+            set_slide_id(document, section)
+
+    document.note_implicit_target(section, section)
+
+
+def build_deck(
+    data: Dict[str, Any],
+    document: nodes.document,
+    env: Optional[BuildEnvironment] = None,
+) -> None:
+    """Add the slides described by ``data`` to ``document``.
+
+    If ``data`` has a ``title``, the slides are added to a title section,
+    like sections below a document's title in reST.
+    """
+
+    if not isinstance(data, dict) or not isinstance(
+        data.get("slides", []), list
+    ):
+        raise DeckError("a deck must be a mapping with a list of slides")
+
+    slides = [make_slide(spec, env) for spec in data.get("slides", [])]
+
+    if data.get("title"):
+        title = str(data["title"])
+        root = nodes.section("", nodes.title(title, title))
+        root.extend(make_blocks(data.get("content", []), env))
+        root.extend(slides)
+        document += root
+    else:
+        document.extend(slides)
+
+    for section in document.traverse(nodes.section):
+        _note_section(document, section)
+
+    # The slides are final, so the newslide transforms can skip them.
+    document["revealjs_deck"] = True
+
+
+def load_deck(text: str, filename: str = "") -> Dict[str, Any]:
+    """Load a deck from JSON, or from YAML if ``filename`` says so."""
+
+    try:
+        if filename.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise DeckError(
+                    "YAML decks require PyYAML; install it with "
+                    "`pip install sphinxcontrib-revealjs[decks]`"
+                )
+            return yaml.safe_load(text)
+
+        return json.loads(text)
+    except (ValueError, getattr(yaml, "YAMLError", ValueError)) as err:
+        raise DeckError(f"cannot load deck: {err}") from err
+
+
+class DeckParser(Parser):
+    """Parse ``.deck.json`` and ``.deck.yaml`` files into slide doctrees."""
+
+    supported = ("revealjs-deck",)
+
+    def parse(self, inputstring: str, document: nodes.document) -> None:
+        try:
+            build_deck(
+                load_deck(inputstring, document["source"]),
+                document,
+                self.env,
+            )
+        except DeckError as err:
+            logger.warning("invalid deck: %s", err, location=self.env.docname)
+
+
+def _rst_text(text: Any) -> str:
+    text = re.sub(r"([\\*`_|])", r"\\\1", str(text))
+    # Don't let paragraphs start lists, comments or directives.
+    return re.sub(r"^([-+#.]|\d+\.)", r"\\\1", text)
+
+
+def _rst_blocks(spec: Any) -> str:
+    if isinstance(spec, list):
+        return "".join(_rst_blocks(block) for block in spec)
+    if not isinstance(spec, dict):
+        return _rst_text(spec) + "\n\n"
+
+    if "text" in spec:
+        return _rst_text(spec["text"]) + "\n\n"
+    if "bullets" in spec:
+        bullets = "".join(
+            "- " + indent(_rst_blocks(item), "  ").strip() + "\n"
+            for item in spec["bullets"]
+        )
+        if spec.get("incremental"):
+            return f".. incr:: {spec['incremental']}\n\n" + (
+                indent(bullets, "   ") + "\n"
+            )
+        return bullets + "\n"
+    if "code" in spec:
+        language = spec.get("language", "")
+        return f".. code-block:: {language}\n\n" + (
+            indent(str(spec["code"]), "   ") + "\n\n"
+        )
+    if "math" in spec:
+        return ".. math::\n\n" + indent(str(spec["math"]), "   ") + "\n\n"
+    if "image" in spec:
+        return f".. image:: {spec['image']}\n\n"
+    if "raw" in spec:
+        return ".. raw:: html\n\n" + indent(str(spec["raw"]), "   ") + "\n\n"
+    if "notes" in spec:
+        return ".. speaker::\n\n" + indent(_rst_blocks(spec["notes"]), "   ")
+    if "fragment" in spec:
+        return ".. incr:: one\n\n" + indent(
+            _rst_blocks(spec["fragment"]), "   "
+        )
+    if "interslide" in spec:
+        options = "".join(
+            f"   :{name}: {spec[name]}\n"
+            for name in SLIDE_OPTIONS
+            if name in spec
+        )
+        return (
+            ".. interslide::\n"
+            + options
+            + "\n"
+            + indent(_rst_blocks(spec["interslide"]), "   ")
+        )
+
+    raise DeckError(f"unknown content block {spec!r}")
+
+
+def _rst_title(title: str, char: str, overline: bool = False) -> str:
+    line = char * len(title)
+    return (line + "\n" if overline else "") + f"{title}\n{line}\n\n"
+
+
+def deck_to_rst(data: Dict[str, Any]) -> str:
+    """Return reST that builds the same slides as ``data``.
+
+    Useful to compare both paths. reST sections can't have slide options,
+    so slides with options raise ``DeckError``.
+    """
+
+    def slide_rst(spec: Dict[str, Any], char: str) -> str:
+        if any(name in spec for name in SLIDE_OPTIONS):
+            raise DeckError(
+                f"slide {spec['title']!r} has options, which reST "
+                "sections can't have"
+            )
+
+        rst = _rst_title(str(spec["title"]), char)
+        rst += _rst_blocks(spec.get("content", []))
+        if "notes" in spec:
+            rst += _rst_blocks({"notes": spec["notes"]})
+        for subslide in spec.get("slides", []):
+            rst += slide_rst(subslide, "-")
+
+        return rst
+
+    rst = ""
+    if data.get("title"):
+        rst += _rst_title(str(data["title"]), "=", overline=True)
+        rst += _rst_blocks(data.get("content", []))
+
+    for spec in data.get("slides", []):
+        rst += slide_rst(spec, "=")
+
+    return rst
+
+
+def sample_deck(slides: int) -> Dict[str, Any]:
+    """Return a data-driven deck like a weekly metrics review."""
+
+    return {
+        "title": "Metrics review",
+        "slides": [
+            {
+                "title": f"Team {i}",
+                "content": [
+                    f"Team {i} closed {i % 17} incidents this week.",
+                    {
+                        "bullets": [
+                            f"Latency p99: {100 + i % 50} ms",
+                            f"Error rate: {i % 7 / 10:.1f}%",
+                            f"Deploys: {i % 11}",
+                        ],
+                        "incremental": "item",
+                    },
+                    {
+                        "code": f"SELECT count(*) FROM incidents "
+                        f"WHERE team = {i};",
+                        "language": "sql",
+                    },
+                ],
+                "notes": f"Ask team {i} about their on-call load.",
+                "slides": [
+                    {
+                        "title": f"Team {i} details",
+                        "content": [{"fragment": f"Owner: person {i}"}],
+                    }
+                ],
+            }
+            for i in range(slides)
+        ],
+    }
+
+
+def benchmark(
+    slides: int = 1000, decks: int = 1, repeat: int = 3
+) -> Dict[str, Dict[str, float]]:
+    """Build the same decks from ``.deck.json`` and ``.rst``; return timings.
+
+    For each path, returns the fastest read phase and whole build, in
+    seconds, of ``repeat`` clean builds.
+    """
+
+    from sphinx.application import Sphinx
+
+    data = sample_deck(slides)
+    sources = {
+        "deck": (".deck.json", json.dumps(data)),
+        "rst": (".rst", deck_to_rst(data)),
+    }
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for kind, (suffix, source) in sources.items():
+            srcdir = path.join(tmpdir, kind)
+            outdir = path.join(srcdir, "_build")
+
+            os.makedirs(srcdir)
+            with open(path.join(srcdir, "conf.py"), "w") as f:
+                f.write(
+                    'extensions = ["sphinxcontrib.revealjs"]\n'
+                    "html_use_index = False\n"
+                    "html_domain_indices = False\n"
+                    'html_sidebars = {"**": []}\n'
+                    'exclude_patterns = ["_build"]\n'
+                )
+            with open(path.join(srcdir, "index" + suffix), "w") as f:
+                f.write(source)
+            for i in range(1, decks):
+                with open(path.join(srcdir, f"deck{i}" + suffix), "w") as f:
+                    f.write(source)
+
+            reads, builds = [], []
+            for _ in range(repeat):
+                read_done = []
+                started = time.perf_counter()
+                app = Sphinx(
+                    srcdir,
+                    srcdir,
+                    path.join(outdir, "revealjs"),
+                    path.join(outdir, "doctrees"),
+                    "revealjs",
+                    status=None,
+                    warning=io.StringIO(),
+                    freshenv=True,
+                )
+                app.connect(
+                    "env-updated",
+                    lambda app, env: read_done.append(time.perf_counter()),
+                )
+                app.build(force_all=True)
+                builds.append(time.perf_counter() - started)
+                reads.append(read_done[0] - started)
+
+            results[kind] = {"read": min(reads), "build": min(builds)}
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinxcontrib.revealjs.decks",
+        description="Generate slide decks from data.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rst_parser = commands.add_parser("rst", help="print a deck as reST")
+    rst_parser.add_argument("deck")
+
+    benchmark_parser = commands.add_parser(
+        "benchmark", help="compare building decks from data and from reST"
+    )
+    benchmark_parser.add_argument("--slides", type=int, default=1000)
+    benchmark_parser.add_argument("--decks", type=int, default=1)
+    benchmark_parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "rst":
+        with open(args.deck, encoding="utf-8") as f:
+            print(deck_to_rst(load_deck(f.read(), args.deck)), end="")
+    elif args.command == "benchmark":
+        results = benchmark(args.slides, args.decks, args.repeat)
+        print(f"{'source':<8} {'read s':>8} {'build s':>8}")
+        for kind, timings in results.items():
+            print(
+                f"{kind:<8} {timings['read']:>8.3f} {timings['build']:>8.3f}"
+            )
+        print(
+            f"reading decks from data is "
+            f"{results['rst']['read'] / results['deck']['read']:.1f}x "
+            f"faster than from reST"
+        )
+
+
+if __name__ == "__main__":
+    main()
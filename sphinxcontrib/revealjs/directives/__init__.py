@@ -2,9 +2,48 @@
 
 from typing import Optional
 
+import re
+
 from docutils.parsers.rst import directives
+from sphinx.util.docutils import SphinxDirective
+
+# See: https://www.w3.org/TR/css-color-4/#named-colors
+CSS_NAMED_COLORS = {
+    "aliceblue", "antiquewhite", "aqua", "aquamarine", "azure", "beige",
+    "bisque", "black", "blanchedalmond", "blue", "blueviolet", "brown",
+    "burlywood", "cadetblue", "chartreuse", "chocolate", "coral",
+    "cornflowerblue", "cornsilk", "crimson", "cyan", "darkblue", "darkcyan",
+    "darkgoldenrod", "darkgray", "darkgreen", "darkgrey", "darkkhaki",
+    "darkmagenta", "darkolivegreen", "darkorange", "darkorchid", "darkred",
+    "darksalmon", "darkseagreen", "darkslateblue", "darkslategray",
+    "darkslategrey", "darkturquoise", "darkviolet", "deeppink",
+    "deepskyblue", "dimgray", "dimgrey", "dodgerblue", "firebrick",
+    "floralwhite", "forestgreen", "fuchsia", "gainsboro", "ghostwhite",
+    "gold", "goldenrod", "gray", "green", "greenyellow", "grey", "honeydew",
+    "hotpink", "indianred", "indigo", "ivory", "khaki", "lavender",
+    "lavenderblush", "lawngreen", "lemonchiffon", "lightblue", "lightcoral",
+    "lightcyan", "lightgoldenrodyellow", "lightgray", "lightgreen",
+    "lightgrey", "lightpink", "lightsalmon", "lightseagreen", "lightskyblue",
+    "lightslategray", "lightslategrey", "lightsteelblue", "lightyellow",
+    "lime", "limegreen", "linen", "magenta", "maroon", "mediumaquamarine",
+    "mediumblue", "mediumorchid", "mediumpurple", "mediumseagreen",
+    "mediumslateblue", "mediumspringgreen", "mediumturquoise",
+    "mediumvioletred", "midnightblue", "mintcream", "mistyrose", "moccasin",
+    "navajowhite", "navy", "oldlace", "olive", "olivedrab", "orange",
+    "orangered", "orchid", "palegoldenrod", "palegreen", "paleturquoise",
+    "palevioletred", "papayawhip", "peachpuff", "peru", "pink", "plum",
+    "powderblue", "purple", "rebeccapurple", "red", "rosybrown",
+    "royalblue", "saddlebrown", "salmon", "sandybrown", "seagreen",
+    "seashell", "sienna", "silver", "skyblue", "slateblue", "slategray",
+    "slategrey", "snow", "springgreen", "steelblue", "tan", "teal",
+    "thistle", "tomato", "turquoise", "violet", "wheat", "white",
+    "whitesmoke", "yellow", "yellowgreen", "transparent", "currentcolor",
+}  # fmt: skip
 
-import xml.dom
+CSS_HEX_COLOR = re.compile(r"^#(?:[0-9a-f]{3,4}|[0-9a-f]{6}|[0-9a-f]{8})$")
+CSS_COLOR_FUNCTION = re.compile(
+    r"^(?:rgba?|hsla?|hwb|lab|lch|oklab|oklch|color|var)\([^()]*\)$"
+)
 
 
 def optional_csscolorvalue(argument: Optional[str]) -> Optional[str]:
@@ -12,14 +51,16 @@ def optional_csscolorvalue(argument: Optional[str]) -> Optional[str]:
 
     if argument is None:
         return None
-    else:
-        pass
-        # try:
-        #     color = cssutils.css.ColorValue(argument)
-        # except xml.dom.SyntaxErr:
-        #     raise ValueError(f"{argument} is not a valid CSS color.")
 
-        # return color.cssText
+    color = argument.strip()
+    if (
+        color.lower() in CSS_NAMED_COLORS
+        or CSS_HEX_COLOR.match(color.lower())
+        or CSS_COLOR_FUNCTION.match(color.lower())
+    ):
+        return color
+
+    raise ValueError(f"{argument} is not a valid CSS color.")
 
 
 def optional_uri(argument: Optional[str]) -> Optional[str]:
@@ -29,3 +70,16 @@ def optional_uri(argument: Optional[str]) -> Optional[str]:
         return None
     else:
         return directives.uri(argument)
+
+
+def content_rawsource(directive: SphinxDirective) -> str:
+    """Return the directive's content as a node's ``rawsource``.
+
+    Returns an empty string if ``revealjs_compact_doctrees`` is enabled,
+    since the content is parsed into the node's children anyway.
+    """
+
+    if directive.config.revealjs_compact_doctrees:
+        return ""
+
+    return "\n".join(directive.content)
@@ -16,6 +16,8 @@ from sphinx.util.docutils import SphinxDirective
 
 from sphinx.util import logging
 
+from . import content_rawsource
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,9 +86,7 @@ class Incremental(SphinxDirective):
     def run(self) -> List[nodes.Node]:
         self.validate_args()
         self.assert_has_content()
-        text = "\n".join(self.content)
-
-        node = nodes.container(text)
+        node = nodes.container(content_rawsource(self))
         self.state.nested_parse(self.content, self.content_offset, node)
 
         if self.arguments[0] == "one":
@@ -99,6 +99,9 @@ class Incremental(SphinxDirective):
             # Since we're gonna discard the parent node, copy
             # classes set by the user onto the first child node
             node.children[0]["classes"] += self.options.get("class", [])
+            # Remember how the child was incremented, so the linter can
+            # check its fragments after the doctree is pickled.
+            node.children[0]["incremental"] = self.arguments[0]
 
             if isinstance(node.children[0], nodes.definition_list):
                 self.contain_definition_list_items(node.children[0])
@@ -1,6 +1,6 @@
 """sphinxcontrib.revealjs.directives.slides"""
 
-from typing import List
+from typing import Any, Dict, List
 from docutils.nodes import Node
 
 from os import path
@@ -8,10 +8,12 @@ from os import path
 from docutils import nodes
 from docutils.parsers.rst import directives
 
+from sphinx.environment import BuildEnvironment
 from sphinx.util.docutils import SphinxDirective
 from sphinx.util.typing import OptionSpec
 
-from . import optional_csscolorvalue, optional_uri
+from . import content_rawsource, optional_csscolorvalue, optional_uri
+from ..assets import note_slide_asset
 from ..addnodes import interslide, newslide
 
 REVEALJS_TRANSITIONS = [  # see: https://revealjs.com/transitions/#styles
@@ -37,6 +39,39 @@ def optional_revealjstransitionspeed(argument: str) -> str:
     return directives.choice(argument, REVEALJS_TRANSITION_SPEEDS)
 
 
+def set_slide_options(
+    node: Node, options: Dict[str, Any], env: BuildEnvironment
+) -> None:
+    """Set slide ``options`` as RevealJS-compatible attributes on ``node``.
+
+    ``options`` have already been converted by ``BaseSlide.option_spec``.
+    """
+
+    node["classes"] += options.get("class", [])
+
+    bg_color = options.get("background-color")
+    if bg_color:
+        node["data-background-color"] = bg_color
+
+    bg_image_path = options.get("background-image")
+    if bg_image_path:
+        # If this is a local URI, track it so the builder copies it and
+        # the deck is rebuilt when it changes
+        if "://" not in bg_image_path:
+            note_slide_asset(env, bg_image_path)
+            bg_image_path = path.join(env.app.builder.imagedir, bg_image_path)
+
+        node["data-background-image"] = bg_image_path
+
+    transition = options.get("transition")
+    if transition:
+        node["data-transition"] = transition
+
+    transition_speed = options.get("transition-speed")
+    if transition_speed:
+        node["data-transition-speed"] = transition_speed
+
+
 class BaseSlide(SphinxDirective):
     """Base for slide directives."""
 
@@ -51,30 +86,7 @@ class BaseSlide(SphinxDirective):
     def handle_options(self, node: Node) -> None:
         """Set ``self.options`` as RevealJS-compatible attributes on ``node``."""
 
-        node["classes"] += self.options.get("class", [])
-
-        bg_color = self.options.get("background-color")
-        if bg_color:
-            node["data-background-color"] = bg_color
-
-        bg_image_path = self.options.get("background-image")
-        if bg_image_path:
-            builder = self.env.app.builder
-
-            # If this isn't a local URI, add image path to builder
-            if "://" not in bg_image_path:
-                builder.images[bg_image_path] = bg_image_path
-                bg_image_path = path.join(builder.imagedir, bg_image_path)
-
-            node["data-background-image"] = bg_image_path
-
-        transition = self.options.get("transition")
-        if transition:
-            node["data-transition"] = transition
-
-        transition_speed = self.options.get("transition-speed")
-        if transition_speed:
-            node["data-transition-speed"] = transition_speed
+        set_slide_options(node, self.options, self.env)
 
 
 class Interslide(BaseSlide):
@@ -89,7 +101,7 @@ class Interslide(BaseSlide):
 
     def run(self) -> List[Node]:
         slide_node = interslide(
-            "\n".join(self.content), classes=["interslide"]
+            content_rawsource(self), classes=["interslide"]
         )
 
         self.handle_options(slide_node)
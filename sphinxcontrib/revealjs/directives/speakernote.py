@@ -3,6 +3,7 @@ from docutils import nodes
 
 from sphinx.util.docutils import SphinxDirective
 
+from . import content_rawsource
 from ..addnodes import speakernote
 
 
@@ -11,7 +12,7 @@ class Speakernote(SphinxDirective):
 
     def run(self) -> List[nodes.Node]:
         self.assert_has_content()
-        node = speakernote("\n".join(self.content))
+        node = speakernote(content_rawsource(self))
         node["classes"] += ["notes"]
         self.add_name(node)
         self.state.nested_parse(self.content, self.content_offset, node)
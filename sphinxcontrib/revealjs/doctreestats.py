@@ -0,0 +1,119 @@
+"""Report the size and load time of pickled doctrees.
+
+Usage::
+
+    $ python -m sphinxcontrib.revealjs.doctreestats _build/doctrees
+    $ python -m sphinxcontrib.revealjs.doctreestats _build/doctrees --sort load
+
+Besides the pickle size and the time it takes to load, each document's
+report shows how many slide and speaker note nodes it has, and how many
+bytes of ``rawsource`` they carry (which ``revealjs_compact_doctrees``
+drops).
+
+Contents:
+    - DoctreeStats
+    - measure_doctree
+    - measure_doctrees
+"""
+
+from typing import Iterator, List, NamedTuple, Optional
+from os import path
+
+import argparse
+import os
+import pickle
+import time
+
+from docutils import nodes
+
+from . import addnodes
+
+
+class DoctreeStats(NamedTuple):
+    docname: str
+    #: Size of the pickled doctree, in bytes.
+    size: int
+    #: Seconds it took to unpickle the doctree.
+    load_time: float
+    #: Number of slide and speaker note nodes.
+    slide_nodes: int
+    #: Bytes of ``rawsource`` in slide and speaker note nodes, including
+    #: their text.
+    slide_rawsource: int
+
+
+def measure_doctree(filename: str, docname: str) -> DoctreeStats:
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    started = time.perf_counter()
+    doctree = pickle.loads(data)
+    load_time = time.perf_counter() - started
+
+    slide_nodes = slide_rawsource = 0
+    for node in doctree.traverse(
+        lambda node: isinstance(node, (addnodes.Slide, addnodes.speakernote))
+    ):
+        slide_nodes += 1
+        slide_rawsource += len(node.rawsource.encode("utf-8"))
+        for text in node.traverse(nodes.Text):
+            slide_rawsource += len(
+                getattr(text, "rawsource", "").encode("utf-8")
+            )
+
+    return DoctreeStats(
+        docname, len(data), load_time, slide_nodes, slide_rawsource
+    )
+
+
+def measure_doctrees(doctreedir: str) -> Iterator[DoctreeStats]:
+    """Yield stats for every pickled doctree in ``doctreedir``."""
+
+    for dirpath, _, filenames in os.walk(doctreedir):
+        for filename in sorted(filenames):
+            if filename.endswith(".doctree"):
+                fullpath = path.join(dirpath, filename)
+                docname = path.relpath(fullpath, doctreedir)[
+                    : -len(".doctree")
+                ]
+                yield measure_doctree(fullpath, docname.replace(os.sep, "/"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinxcontrib.revealjs.doctreestats",
+        description="Report the size and load time of pickled doctrees.",
+    )
+    parser.add_argument("doctreedir")
+    parser.add_argument(
+        "--sort", choices=["name", "size", "load"], default="size"
+    )
+    parser.add_argument("--top", type=int, help="only show the top N")
+    args = parser.parse_args(argv)
+
+    stats = list(measure_doctrees(args.doctreedir))
+    if args.sort == "size":
+        stats.sort(key=lambda s: s.size, reverse=True)
+    elif args.sort == "load":
+        stats.sort(key=lambda s: s.load_time, reverse=True)
+
+    print(
+        f"{'document':<40} {'size':>10} {'load ms':>9} "
+        f"{'slides':>7} {'rawsource':>10}"
+    )
+    for s in stats[: args.top]:
+        print(
+            f"{s.docname:<40} {s.size:>10} {s.load_time * 1000:>9.2f} "
+            f"{s.slide_nodes:>7} {s.slide_rawsource:>10}"
+        )
+
+    print(
+        f"{'total':<40} {sum(s.size for s in stats):>10} "
+        f"{sum(s.load_time for s in stats) * 1000:>9.2f} "
+        f"{sum(s.slide_nodes for s in stats):>7} "
+        f"{sum(s.slide_rawsource for s in stats):>10}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""RevealJS deck linter.
+
+The ``revealjs-lint`` builder checks slide decks for mistakes that would
+otherwise only show up in the browser: invalid slide options, missing assets,
+fragments that won't animate and slides with too much content. It works on
+the doctrees in the environment and doesn't write any HTML.
+
+Results are cached per document, keyed by a hash of its pickled doctree, so
+only documents that changed since the last run are checked again.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from os import path
+
+import hashlib
+import math
+import pickle
+
+from docutils import nodes
+from sphinx.builders import Builder
+from sphinx.util import logging, progress_message
+from sphinx.util.parallel import ParallelTasks, make_chunks, parallel_available
+
+from . import addnodes
+from .directives import optional_csscolorvalue
+from .directives.slides import REVEALJS_TRANSITIONS, REVEALJS_TRANSITION_SPEEDS
+
+logger = logging.getLogger(__name__)
+
+#: Rough number of characters that fit on one line of a slide.
+CHARS_PER_LINE = 60
+
+#: Lint findings for one document: (line, message)
+Findings = List[Tuple[Optional[int], str]]
+
+
+def get_line(node: nodes.Node) -> Optional[int]:
+    """Return the line of ``node`` or its closest ancestor with a line."""
+
+    while node is not None:
+        if node.line:
+            return node.line
+        node = node.parent
+
+    return None
+
+
+def iter_slides(doctree: nodes.document) -> Iterator[List[nodes.Node]]:
+    """Yield the content of each slide in ``doctree``.
+
+    Sections and interslides start a new slide, and so do newslides (which
+    haven't been processed yet, since they're only split out when the
+    doctree is resolved). Titles and nested slides aren't part of a slide's
+    content.
+    """
+
+    for slide in doctree.traverse(
+        lambda node: isinstance(node, (nodes.section, addnodes.interslide))
+    ):
+        content: List[nodes.Node] = []
+        for child in slide.children:
+            if isinstance(child, addnodes.newslide):
+                yield content
+                content = []
+            elif not isinstance(
+                child, (nodes.title, nodes.section, addnodes.interslide)
+            ):
+                content.append(child)
+
+        yield content
+
+
+def in_speakernote(node: nodes.Node) -> bool:
+    return any(
+        isinstance(ancestor, addnodes.speakernote)
+        for ancestor in _ancestors(node)
+    )
+
+
+def _ancestors(node: nodes.Node) -> Iterator[nodes.Node]:
+    node = node.parent
+    while node is not None:
+        yield node
+        node = node.parent
+
+
+def check_slide_options(doctree: nodes.document) -> Findings:
+    """Check ``data-*`` attributes set by the slide directives."""
+
+    findings: Findings = []
+
+    for node in doctree.traverse(nodes.Element):
+        color = node.get("data-background-color")
+        if color:
+            try:
+                optional_csscolorvalue(color)
+            except ValueError as err:
+                findings.append((get_line(node), str(err)))
+
+        transition = node.get("data-transition")
+        if transition and transition not in REVEALJS_TRANSITIONS:
+            findings.append(
+                (
+                    get_line(node),
+                    f"{transition} must be one of {REVEALJS_TRANSITIONS}",
+                )
+            )
+
+        speed = node.get("data-transition-speed")
+        if speed and speed not in REVEALJS_TRANSITION_SPEEDS:
+            findings.append(
+                (
+                    get_line(node),
+                    f"{speed} must be one of {REVEALJS_TRANSITION_SPEEDS}",
+                )
+            )
+
+    return findings
+
+
+def check_fragments(doctree: nodes.document) -> Findings:
+    """Check that fragments will actually animate."""
+
+    findings: Findings = []
+
+    for node in doctree.traverse(nodes.Element):
+        if "fragment" in node["classes"] and in_speakernote(node):
+            findings.append(
+                (get_line(node), "fragments have no effect in speaker notes")
+            )
+
+        if "incremental" in node.attributes and not any(
+            "fragment" in child["classes"]
+            for child in node.traverse(nodes.Element)
+        ):
+            findings.append(
+                (
+                    get_line(node),
+                    f"'incremental {node['incremental']}' didn't create "
+                    "any fragments; its contents must be a list or sequence",
+                )
+            )
+
+    return findings
+
+
+def measure_slide(content: List[nodes.Node]) -> Tuple[int, int]:
+    """Estimate the characters and lines of text in a slide.
+
+    Literal blocks are measured by their actual lines. Other text elements
+    are assumed to wrap at ``CHARS_PER_LINE``.
+    """
+
+    chars = lines = 0
+
+    for child in content:
+        if isinstance(child, addnodes.speakernote):
+            continue
+
+        for node in child.traverse(nodes.TextElement):
+            if in_speakernote(node) or isinstance(
+                node.parent, nodes.TextElement
+            ):
+                continue
+
+            text = node.astext()
+            chars += len(text)
+
+            if isinstance(node, nodes.literal_block):
+                lines += text.count("\n") + 1
+            else:
+                lines += max(1, math.ceil(len(text) / CHARS_PER_LINE))
+
+    return chars, lines
+
+
+def check_slide_size(
+    doctree: nodes.document, max_chars: int, max_lines: int
+) -> Findings:
+    """Warn about slides that likely overflow the screen."""
+
+    findings: Findings = []
+
+    for content in iter_slides(doctree):
+        if not content:
+            continue
+
+        chars, lines = measure_slide(content)
+        if chars > max_chars or lines > max_lines:
+            findings.append(
+                (
+                    get_line(content[0]),
+                    f"slide may overflow: about {lines} lines and {chars} "
+                    f"characters (max {max_lines} lines, {max_chars} "
+                    "characters)",
+                )
+            )
+
+    return findings
+
+
+def collect_assets(doctree: nodes.document) -> List[Tuple[Optional[int], str]]:
+    """Return local assets used by slides, relative to the source directory."""
+
+    assets = []
+
+    for node in doctree.traverse(nodes.Element):
+        bg_image = node.get("data-background-image")
+        if bg_image and "://" not in bg_image:
+            assets.append((get_line(node), bg_image))
+
+    for node in doctree.traverse(nodes.image):
+        for mimetype, candidate in node.get("candidates", {}).items():
+            if mimetype != "?":
+                assets.append((get_line(node), candidate))
+
+    return assets
+
+
+class RevealJSLintBuilder(Builder):
+    """Check RevealJS slide decks without writing them."""
+
+    name = "revealjs-lint"
+    epilog = "Lint finished; see the warnings above for problems."
+
+    #: Cache format; bump this if the cached findings change.
+    cache_version = 1
+    cache_filename = "revealjs-lint.pickle"
+
+    def init(self) -> None:
+        #: docname -> (doctree hash, findings, assets)
+        self.cache: Dict[str, Tuple[str, Findings, Any]] = {}
+        self.linted: Set[str] = set()
+
+        try:
+            with open(self.cache_path, "rb") as f:
+                version, config, cache = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return
+
+        if version == self.cache_version and config == self.lint_config:
+            self.cache = cache
+
+    @property
+    def cache_path(self) -> str:
+        return path.join(self.doctreedir, self.cache_filename)
+
+    @property
+    def lint_config(self) -> Tuple[int, int]:
+        return (
+            self.config.revealjs_lint_max_chars,
+            self.config.revealjs_lint_max_lines,
+        )
+
+    def get_outdated_docs(self) -> Iterable[str]:
+        return self.env.found_docs
+
+    def get_target_uri(self, docname: str, typ: Optional[str] = None) -> str:
+        return ""
+
+    def prepare_writing(self, docnames: Set[str]) -> None:
+        return None
+
+    def doctree_hash(self, docname: str) -> str:
+        doctree_path = path.join(self.doctreedir, docname + ".doctree")
+        with open(doctree_path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def lint_doc(self, docname: str) -> Tuple[Findings, Any]:
+        doctree = self.env.get_doctree(docname)
+        max_chars, max_lines = self.lint_config
+
+        findings = (
+            check_slide_options(doctree)
+            + check_fragments(doctree)
+            + check_slide_size(doctree, max_chars, max_lines)
+        )
+
+        return findings, collect_assets(doctree)
+
+    def lint_docs(self, docnames: List[str]) -> List[Tuple[Findings, Any]]:
+        return [self.lint_doc(docname) for docname in docnames]
+
+    def write(
+        self,
+        build_docnames: Iterable[str],
+        updated_docnames: Iterable[str],
+        method: str = "update",
+    ) -> None:
+        hashes = {
+            docname: self.doctree_hash(docname)
+            for docname in sorted(self.env.found_docs)
+        }
+        outdated = [
+            docname
+            for docname, digest in hashes.items()
+            if self.cache.get(docname, (None,))[0] != digest
+        ]
+
+        def on_linted(docnames: List[str], results: List[Tuple]) -> None:
+            for docname, (findings, assets) in zip(docnames, results):
+                self.cache[docname] = (hashes[docname], findings, assets)
+                self.linted.add(docname)
+
+        with progress_message(f"linting {len(outdated)} documents"):
+            if parallel_available and self.app.parallel > 1 and outdated:
+                tasks = ParallelTasks(self.app.parallel)
+                for chunk in make_chunks(outdated, self.app.parallel):
+                    tasks.add_task(self.lint_docs, chunk, on_linted)
+                tasks.join()
+            elif outdated:
+                on_linted(outdated, self.lint_docs(outdated))
+
+        for docname in sorted(hashes):
+            _, findings, assets = self.cache[docname]
+
+            for line, message in findings:
+                logger.warning(
+                    message,
+                    location=(docname, line),
+                    type="revealjs",
+                    subtype="lint",
+                )
+
+            for line, asset in assets:
+                if not self.asset_exists(asset):
+                    logger.warning(
+                        f"slide asset not found: {asset}",
+                        location=(docname, line),
+                        type="revealjs",
+                        subtype="lint",
+                    )
+
+        # Drop documents that were removed from the project.
+        for docname in set(self.cache) - set(hashes):
+            del self.cache[docname]
+
+    def asset_exists(self, asset: str) -> bool:
+        """Check for ``asset`` in the source directory.
+
+        Slide directives read by an HTML builder point background images at
+        the builder's image directory, so look for the original file too.
+        """
+
+        if path.exists(path.join(self.srcdir, asset)):
+            return True
+
+        imagedir = "_images/"
+        return asset.startswith(imagedir) and path.exists(
+            path.join(self.srcdir, asset[len(imagedir) :])
+        )
+
+    def finish(self) -> None:
+        with open(self.cache_path, "wb") as f:
+            pickle.dump(
+                (self.cache_version, self.lint_config, self.cache),
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+
+        logger.info(
+            "linted %d documents (%d cached)",
+            len(self.cache),
+            len(self.cache) - len(self.linted),
+        )
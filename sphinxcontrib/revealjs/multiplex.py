@@ -0,0 +1,319 @@
+"""Audience sync (multiplex) server.
+
+Broadcasts the presenter's position in a deck to everyone following along on
+their own device. The presenter opens the master variant of a deck, which
+sends its state to this server whenever the slide or fragment changes; the
+server forwards it to every follower of that deck.
+
+Rooms only exist while a deck has a presenter or followers connected.
+
+State changes are coalesced: if the presenter moves faster than
+``interval``, followers only receive the latest state. Each broadcast is
+written to all followers at once, without waiting on slow connections.
+
+Requires ``websockets`` (``pip install sphinxcontrib-revealjs[multiplex]``).
+
+Usage::
+
+    $ python -m sphinxcontrib.revealjs.multiplex credentials
+    $ python -m sphinxcontrib.revealjs.multiplex serve --port 1948
+    $ python -m sphinxcontrib.revealjs.multiplex loadtest --followers 2000
+
+Contents:
+    - socket_id
+    - make_credentials
+    - MultiplexServer
+    - loadtest
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import secrets
+import statistics
+import time
+
+try:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import broadcast, serve
+    from websockets.exceptions import ConnectionClosed
+except ImportError:  # pragma: no cover
+    connect = broadcast = serve = None
+    ConnectionClosed = Exception
+
+
+def socket_id(secret: str) -> str:
+    """Return the public id of the deck broadcast with ``secret``."""
+
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def make_credentials() -> Tuple[str, str]:
+    """Return a new ``(secret, id)`` for ``revealjs_multiplex``."""
+
+    secret = secrets.token_hex(16)
+    return secret, socket_id(secret)
+
+
+def _require_websockets() -> None:
+    if serve is None:
+        raise RuntimeError(
+            "the multiplex server requires websockets; install it with "
+            "`pip install sphinxcontrib-revealjs[multiplex]`"
+        )
+
+
+class Room:
+    """Followers of one deck and the presenter's latest state."""
+
+    def __init__(self) -> None:
+        self.followers: Set[Any] = set()
+        #: Number of connected masters.
+        self.masters = 0
+        self.state: Optional[str] = None
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MultiplexServer:
+    """Websocket server that fans the presenter's state out to followers.
+
+    Every connection starts with a JSON hello message:
+    ``{"role": "master", "id": ..., "secret": ...}`` for the presenter, or
+    ``{"role": "follower", "id": ...}`` for everyone else. After that, the
+    master sends ``{"state": ...}`` messages, which are forwarded to the
+    followers unchanged.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        _require_websockets()
+
+        #: Seconds to wait for more state changes before broadcasting.
+        self.interval = interval
+        self.rooms: Dict[str, Room] = {}
+        #: Number of broadcasts sent and state changes received.
+        self.broadcasts = 0
+        self.changes = 0
+
+    def get_room(self, deck_id: str) -> Room:
+        if deck_id not in self.rooms:
+            room = self.rooms[deck_id] = Room()
+            room.task = asyncio.create_task(self.fan_out(room))
+
+        return self.rooms[deck_id]
+
+    def release_room(self, deck_id: str) -> None:
+        """Remove a room once it has no master and no followers."""
+
+        room = self.rooms.get(deck_id)
+        if room is None or room.masters or room.followers:
+            return
+
+        del self.rooms[deck_id]
+        if room.task:
+            room.task.cancel()
+
+    async def fan_out(self, room: Room) -> None:
+        while True:
+            await room.changed.wait()
+            await asyncio.sleep(self.interval)
+            room.changed.clear()
+
+            if room.followers and room.state is not None:
+                broadcast(room.followers, room.state)
+                self.broadcasts += 1
+
+    async def handler(self, websocket: Any) -> None:
+        try:
+            hello = json.loads(await websocket.recv())
+            deck_id = str(hello["id"])
+            role = hello.get("role", "follower")
+        except (ValueError, KeyError, TypeError, ConnectionClosed):
+            await websocket.close(1008, "invalid hello message")
+            return
+
+        # Check the secret first, so bad masters don't create rooms.
+        if role == "master" and not hmac.compare_digest(
+            socket_id(str(hello.get("secret", ""))), deck_id
+        ):
+            await websocket.close(1008, "invalid secret")
+            return
+
+        room = self.get_room(deck_id)
+        try:
+            if role == "master":
+                room.masters += 1
+                try:
+                    async for message in websocket:
+                        room.state = message
+                        room.changed.set()
+                        self.changes += 1
+                finally:
+                    room.masters -= 1
+            else:
+                room.followers.add(websocket)
+                try:
+                    if room.state is not None:
+                        await websocket.send(room.state)
+                    await websocket.wait_closed()
+                finally:
+                    room.followers.discard(websocket)
+        finally:
+            self.release_room(deck_id)
+
+    async def serve(self, host: str, port: int) -> Any:
+        """Start serving and return the websockets server."""
+
+        return await serve(
+            self.handler, host, port, max_size=2**16, compression=None
+        )
+
+    def close(self) -> None:
+        """Stop broadcasting to every room."""
+
+        for room in self.rooms.values():
+            if room.task:
+                room.task.cancel()
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        server = await self.serve(host, port)
+        print(f"multiplex server listening on ws://{host}:{port}")
+        await server.serve_forever()
+
+
+async def loadtest(
+    url: Optional[str] = None,
+    followers: int = 1000,
+    changes: int = 200,
+    rate: float = 20,
+    interval: float = 0.05,
+) -> Dict[str, float]:
+    """Simulate one presenter and many followers; return delivery stats.
+
+    If ``url`` isn't given, a server is started on a free local port.
+    """
+
+    _require_websockets()
+
+    server = None
+    if url is None:
+        multiplex = MultiplexServer(interval=interval)
+        server = await multiplex.serve("127.0.0.1", 0)
+        port = list(server.sockets)[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+
+    secret, deck_id = make_credentials()
+    latencies: List[float] = []
+    received = [0]
+    last_index: List[int] = []
+
+    async def follow(i: int, ready: asyncio.Event) -> None:
+        async with connect(url, max_queue=None, compression=None) as ws:
+            await ws.send(json.dumps({"role": "follower", "id": deck_id}))
+            ready.set()
+            async for message in ws:
+                state = json.loads(message)["state"]
+                latencies.append(time.perf_counter() - state["sent"])
+                received[0] += 1
+                if state["indexh"] == changes - 1:
+                    break
+            last_index.append(i)
+
+    readies = [asyncio.Event() for _ in range(followers)]
+    tasks = [
+        asyncio.create_task(follow(i, ready))
+        for i, ready in enumerate(readies)
+    ]
+    await asyncio.gather(*(ready.wait() for ready in readies))
+
+    started = time.perf_counter()
+    async with connect(url, compression=None) as master:
+        await master.send(
+            json.dumps({"role": "master", "id": deck_id, "secret": secret})
+        )
+        for indexh in range(changes):
+            state = {
+                "indexh": indexh,
+                "indexv": 0,
+                "sent": time.perf_counter(),
+            }
+            await master.send(json.dumps({"state": state}))
+            await asyncio.sleep(1 / rate)
+
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=60)
+
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        multiplex.close()
+
+    latencies.sort()
+    return {
+        "followers": followers,
+        "changes": changes,
+        "messages": received[0],
+        "seconds": elapsed,
+        "latency_p50": statistics.median(latencies),
+        "latency_p99": latencies[int(len(latencies) * 0.99) - 1],
+        "completed": len(last_index),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinxcontrib.revealjs.multiplex",
+        description="Audience sync server for RevealJS decks.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "credentials", help="print a new secret and id for revealjs_multiplex"
+    )
+
+    serve_parser = commands.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=1948)
+    serve_parser.add_argument("--interval", type=float, default=0.05)
+
+    loadtest_parser = commands.add_parser(
+        "loadtest", help="simulate a presenter and many followers"
+    )
+    loadtest_parser.add_argument(
+        "--url", help="server to test (default: local)"
+    )
+    loadtest_parser.add_argument("--followers", type=int, default=1000)
+    loadtest_parser.add_argument("--changes", type=int, default=200)
+    loadtest_parser.add_argument("--rate", type=float, default=20)
+    loadtest_parser.add_argument("--interval", type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "credentials":
+        secret, deck_id = make_credentials()
+        print(
+            f'revealjs_multiplex = {{"secret": "{secret}", "id": "{deck_id}"}}'
+        )
+    elif args.command == "serve":
+        server = MultiplexServer(interval=args.interval)
+        asyncio.run(server.serve_forever(args.host, args.port))
+    elif args.command == "loadtest":
+        stats = asyncio.run(
+            loadtest(
+                args.url,
+                args.followers,
+                args.changes,
+                args.rate,
+                args.interval,
+            )
+        )
+        for name, value in stats.items():
+            print(f"{name}: {value:.4g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""sphinxcontrib.revealjs.outputs
+
+Leave output files untouched when a build doesn't change them, so unchanged
+decks keep their bytes and modification times, and ``rsync`` and CDNs only
+see the files that actually changed.
+
+Contents:
+    - write_if_changed
+    - replace_if_changed
+    - snapshot
+    - changed_outputs
+    - report_changed_outputs
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+from os import path
+
+import filecmp
+import os
+
+from sphinx.application import Sphinx
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+#: path relative to the output directory -> (size, mtime_ns)
+Snapshot = Dict[str, Tuple[int, int]]
+
+#: Added to the page name of a deck's multiplex master variant.
+MASTER_SUFFIX = "-master"
+
+
+def write_if_changed(filename: str, content: Union[str, bytes]) -> bool:
+    """Write ``content`` to ``filename`` unless it already contains it.
+
+    Returns whether the file was written.
+    """
+
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    try:
+        with open(filename, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+
+    with open(filename, "wb") as f:
+        f.write(data)
+    return True
+
+
+def replace_if_changed(tmpfilename: str, filename: str) -> bool:
+    """Move ``tmpfilename`` to ``filename`` if their contents differ.
+
+    Otherwise ``tmpfilename`` is removed. Returns whether ``filename`` was
+    replaced.
+    """
+
+    if path.exists(filename) and filecmp.cmp(
+        tmpfilename, filename, shallow=False
+    ):
+        os.remove(tmpfilename)
+        return False
+
+    os.replace(tmpfilename, filename)
+    return True
+
+
+def snapshot(outdir: str, doctreedir: Optional[str] = None) -> Snapshot:
+    """Return the size and modification time of every file in ``outdir``.
+
+    Dot-directories and ``doctreedir``, which is ``outdir/.doctrees`` by
+    default, are skipped, since they don't hold output files.
+    """
+
+    skipped = path.abspath(doctreedir) if doctreedir else None
+    files: Snapshot = {}
+    for dirpath, dirnames, filenames in os.walk(outdir):
+        dirnames[:] = [
+            d
+            for d in dirnames
+            if not d.startswith(".")
+            and path.abspath(path.join(dirpath, d)) != skipped
+        ]
+
+        for filename in filenames:
+            fullpath = path.join(dirpath, filename)
+            stat = os.stat(fullpath)
+            relpath = path.relpath(fullpath, outdir).replace(os.sep, "/")
+            files[relpath] = (stat.st_size, stat.st_mtime_ns)
+
+    return files
+
+
+def changed_outputs(before: Snapshot, after: Snapshot) -> List[str]:
+    """Return the files added or modified between two snapshots."""
+
+    return sorted(
+        filename
+        for filename, stat in after.items()
+        if before.get(filename) != stat
+    )
+
+
+def report_changed_outputs(
+    app: Sphinx, exception: Optional[Exception]
+) -> None:
+    """Log which output files the build wrote.
+
+    Runs after the other ``build-finished`` handlers, so generated files like
+    the service worker and compressed sidecars are included.
+    """
+
+    before = getattr(app.builder, "outputs_before", None)
+    if exception or before is None:
+        return
+
+    # Master pages hold the multiplex secret, so they aren't listed.
+    masters = set(app.builder.master_pages.values())
+    after = {
+        filename: stat
+        for filename, stat in snapshot(app.outdir, app.doctreedir).items()
+        if filename not in masters
+    }
+    changed = changed_outputs(before, after)
+    app.builder.outputs_changed = changed
+
+    logger.info(
+        "%d output files changed, %d unchanged",
+        len(changed),
+        len(after) - len(changed),
+    )
+    for filename in changed:
+        logger.info("    %s", filename)
@@ -0,0 +1,73 @@
+/*
+ * Audience sync for sphinxcontrib-revealjs.
+ *
+ * The master variant of a deck sends its state to the multiplex server
+ * whenever the slide or fragment changes; followers apply every state they
+ * receive. Configure with `Reveal.initialize({multiplex: {url, id, secret}})`;
+ * only the master variant has a secret.
+ */
+window.RevealMultiplex = function () {
+  return {
+    id: "multiplex",
+
+    init: function (deck) {
+      var config = deck.getConfig().multiplex || {};
+      if (!config.url || !config.id) {
+        return;
+      }
+
+      var isMaster = Boolean(config.secret);
+      var socket = null;
+      var retryDelay = 1000;
+
+      function sendState() {
+        if (isMaster && socket && socket.readyState === WebSocket.OPEN) {
+          socket.send(JSON.stringify({ state: deck.getState() }));
+        }
+      }
+
+      function connect() {
+        socket = new WebSocket(config.url);
+
+        socket.addEventListener("open", function () {
+          retryDelay = 1000;
+          socket.send(
+            JSON.stringify({
+              role: isMaster ? "master" : "follower",
+              id: config.id,
+              secret: config.secret,
+            })
+          );
+          sendState();
+        });
+
+        socket.addEventListener("message", function (event) {
+          if (!isMaster) {
+            deck.setState(JSON.parse(event.data).state);
+          }
+        });
+
+        socket.addEventListener("close", function () {
+          setTimeout(connect, retryDelay);
+          retryDelay = Math.min(retryDelay * 2, 30000);
+        });
+      }
+
+      if (isMaster) {
+        [
+          "slidechanged",
+          "fragmentshown",
+          "fragmenthidden",
+          "overviewshown",
+          "overviewhidden",
+          "paused",
+          "resumed",
+        ].forEach(function (eventName) {
+          deck.on(eventName, sendState);
+        });
+      }
+
+      connect();
+    },
+  };
+};
@@ -0,0 +1,142 @@
+/*
+ * Slide performance telemetry for sphinxcontrib-revealjs.
+ *
+ * Records how long each slide transition takes, long tasks while a slide is
+ * shown, and how long the slide's images take to decode. Samples are keyed
+ * by the slide's id and sent in batches to the endpoint in this script's
+ * `data-endpoint` attribute, with `navigator.sendBeacon`.
+ */
+(function () {
+  var script = document.currentScript;
+  var endpoint = script && script.dataset.endpoint;
+  if (!endpoint || !window.Reveal) {
+    return;
+  }
+
+  var deck = window.location.pathname;
+  var samples = [];
+  var decoded = {};
+  var currentSlide = null;
+  var transitionStart = null;
+
+  function slideId(slide) {
+    if (!slide) {
+      return null;
+    }
+    if (slide.id) {
+      return slide.id;
+    }
+    var indices = Reveal.getIndices(slide);
+    return "slide-" + indices.h + "-" + (indices.v || 0);
+  }
+
+  function record(slide, kind, value) {
+    if (slide) {
+      samples.push({ slide: slide, kind: kind, value: Math.round(value) });
+    }
+  }
+
+  function flush() {
+    if (!samples.length) {
+      return;
+    }
+    var payload = JSON.stringify({ deck: deck, samples: samples });
+    samples = [];
+    navigator.sendBeacon(endpoint, payload);
+  }
+
+  function afterFrames(callback) {
+    requestAnimationFrame(function () {
+      requestAnimationFrame(callback);
+    });
+  }
+
+  function measureDecode(slide, url, image) {
+    if (decoded[url]) {
+      return;
+    }
+    decoded[url] = true;
+
+    image = image || new Image();
+    if (!image.src) {
+      image.src = url;
+    }
+    if (!image.decode) {
+      return;
+    }
+
+    var started = performance.now();
+    image.decode().then(
+      function () {
+        record(slide, "decode", performance.now() - started);
+      },
+      function () {}
+    );
+  }
+
+  function measureImages(slide) {
+    var id = slideId(slide);
+
+    Array.prototype.forEach.call(slide.querySelectorAll("img"), function (img) {
+      measureDecode(id, img.currentSrc || img.src, img);
+    });
+
+    var background = slide.getAttribute("data-background-image");
+    if (background) {
+      measureDecode(id, new URL(background, document.baseURI).href);
+    }
+  }
+
+  function endTransition() {
+    if (transitionStart !== null) {
+      record(
+        slideId(currentSlide),
+        "transition",
+        performance.now() - transitionStart
+      );
+      transitionStart = null;
+    }
+  }
+
+  function showSlide(slide) {
+    currentSlide = slide;
+    transitionStart = performance.now();
+    measureImages(slide);
+
+    var transition =
+      slide.getAttribute("data-transition") || Reveal.getConfig().transition;
+    if (transition === "none") {
+      afterFrames(endTransition);
+    }
+  }
+
+  Reveal.on("ready", function (event) {
+    currentSlide = event.currentSlide;
+    measureImages(currentSlide);
+  });
+  Reveal.on("slidechanged", function (event) {
+    endTransition();
+    showSlide(event.currentSlide);
+  });
+  Reveal.on("slidetransitionend", endTransition);
+
+  if (window.PerformanceObserver) {
+    try {
+      new PerformanceObserver(function (list) {
+        list.getEntries().forEach(function (entry) {
+          record(slideId(currentSlide), "longtask", entry.duration);
+        });
+      }).observe({ type: "longtask", buffered: true });
+    } catch (err) {
+      // Long tasks aren't supported by this browser.
+    }
+  }
+
+  setInterval(flush, 10000);
+  document.addEventListener("visibilitychange", function () {
+    if (document.visibilityState === "hidden") {
+      flush();
+    }
+  });
+  window.addEventListener("pagehide", flush);
+})();
@@ -0,0 +1,199 @@
+"""sphinxcontrib.revealjs.plugins
+
+Registry of RevealJS plugins. Each plugin declares the files it ships, the
+scripts and stylesheets a deck loads, and how it's passed to
+``Reveal.initialize``.
+
+A plugin can also declare the nodes that use it, such as speaker notes or
+code blocks. Those plugins are only copied and loaded for decks whose
+resolved doctrees contain one of those nodes; plugins without nodes are
+loaded by every deck.
+
+Contents:
+    - RevealJSPlugin
+    - BUILTIN_PLUGINS
+    - plugin_from_config
+    - get_plugins
+    - find_used_plugins
+    - initialize_script
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from os import path
+from textwrap import indent
+
+from docutils import nodes
+from sphinx import addnodes as sphinx_addnodes
+from sphinx.config import Config
+from sphinx.errors import ConfigError
+
+from . import addnodes
+
+package_dir = path.abspath(path.dirname(__file__))
+revealjs_plugindir = path.join(package_dir, "lib/revealjs/plugin")
+plugindir = path.join(package_dir, "plugin")
+
+
+class RevealJSPlugin(NamedTuple):
+    name: str
+    #: Directory copied to ``_static/plugin/<name>``.
+    source: str
+    #: Scripts and stylesheets to load, relative to ``source``.
+    scripts: Tuple[str, ...] = ()
+    stylesheets: Tuple[str, ...] = ()
+    #: JavaScript expression added to ``plugins`` in ``Reveal.initialize``.
+    init: Optional[str] = None
+    #: Other ``Reveal.initialize`` options: name, JavaScript expression.
+    options: Tuple[Tuple[str, str], ...] = ()
+    #: Node classes that use the plugin. If empty, every deck loads it.
+    used_by: Tuple[type, ...] = ()
+
+    def is_used(self, doctree: nodes.document) -> bool:
+        if not self.used_by:
+            return True
+
+        for _ in doctree.traverse(lambda node: isinstance(node, self.used_by)):
+            return True
+
+        return False
+
+
+#: Plugins that can be enabled by name in ``revealjs_plugins``.
+BUILTIN_PLUGINS = [
+    RevealJSPlugin(
+        "notes",
+        path.join(revealjs_plugindir, "notes"),
+        scripts=("notes.js",),
+        init="RevealNotes",
+        used_by=(addnodes.speakernote,),
+    ),
+    RevealJSPlugin(
+        "highlight",
+        path.join(revealjs_plugindir, "highlight"),
+        scripts=("highlight.js",),
+        stylesheets=("monokai.css",),
+        init="RevealHighlight",
+        used_by=(nodes.literal_block,),
+    ),
+    RevealJSPlugin(
+        "math",
+        path.join(revealjs_plugindir, "math"),
+        scripts=("math.js",),
+        init="RevealMath",
+        used_by=(nodes.math, nodes.math_block),
+    ),
+    RevealJSPlugin(
+        "zoom",
+        path.join(revealjs_plugindir, "zoom"),
+        scripts=("zoom.js",),
+        init="RevealZoom",
+    ),
+    RevealJSPlugin(
+        "search",
+        path.join(revealjs_plugindir, "search"),
+        scripts=("search.js",),
+        init="RevealSearch",
+    ),
+]
+
+#: Loaded by every deck when ``revealjs_multiplex`` is set.
+MULTIPLEX_PLUGIN = RevealJSPlugin(
+    "multiplex",
+    path.join(plugindir, "multiplex"),
+    scripts=("multiplex.js",),
+    init="RevealMultiplex",
+    options=(("multiplex", "window.RevealMultiplexConfig"),),
+)
+
+
+def _node_class(name: str) -> type:
+    node_class = (
+        getattr(addnodes, name, None)
+        or getattr(sphinx_addnodes, name, None)
+        or getattr(nodes, name, None)
+    )
+    if not isinstance(node_class, type):
+        raise ConfigError(
+            f"revealjs_plugins: {name!r} is not a docutils, Sphinx or "
+            "RevealJS node"
+        )
+
+    return node_class
+
+
+def plugin_from_config(plugin: Dict[str, Any], confdir: str) -> RevealJSPlugin:
+    """Return the plugin described by a ``revealjs_plugins`` dict.
+
+    ``path`` is relative to the configuration directory, and ``nodes`` are
+    node class names, looked up like ``revealjs_prune_nodes``.
+    """
+
+    try:
+        name = plugin["name"]
+        source = path.join(confdir, plugin["path"])
+    except KeyError as err:
+        raise ConfigError(
+            f"revealjs_plugins: plugin {plugin!r} has no {err.args[0]!r}"
+        ) from err
+
+    return RevealJSPlugin(
+        name,
+        source,
+        scripts=tuple(plugin.get("scripts", ())),
+        stylesheets=tuple(plugin.get("stylesheets", ())),
+        init=plugin.get("init"),
+        options=tuple(plugin.get("options", {}).items()),
+        used_by=tuple(_node_class(name) for name in plugin.get("nodes", ())),
+    )
+
+
+def get_plugins(
+    config: Config, confdir: str, multiplex: bool = False
+) -> List[RevealJSPlugin]:
+    """Return the plugins enabled by ``revealjs_plugins``, in order."""
+
+    builtins = {plugin.name: plugin for plugin in BUILTIN_PLUGINS}
+    plugins = []
+
+    for plugin in config.revealjs_plugins:
+        if isinstance(plugin, dict):
+            plugins.append(plugin_from_config(plugin, confdir))
+        elif plugin in builtins:
+            plugins.append(builtins[plugin])
+        else:
+            raise ConfigError(
+                f"revealjs_plugins: unknown plugin {plugin!r}; "
+                f"built-in plugins are {', '.join(builtins)}"
+            )
+
+    if multiplex:
+        plugins.append(MULTIPLEX_PLUGIN)
+
+    return plugins
+
+
+def find_used_plugins(
+    plugins: Sequence[RevealJSPlugin], doctree: nodes.document
+) -> List[str]:
+    """Return the names of ``plugins`` that ``doctree`` uses."""
+
+    return [plugin.name for plugin in plugins if plugin.is_used(doctree)]
+
+
+def initialize_script(plugins: Sequence[RevealJSPlugin]) -> str:
+    """Return the ``Reveal.initialize`` call for a deck using ``plugins``."""
+
+    options = [("hash", "true")]
+    for plugin in plugins:
+        options.extend(plugin.options)
+    options.append(
+        (
+            "plugins",
+            "[%s]"
+            % ", ".join(plugin.init for plugin in plugins if plugin.init),
+        )
+    )
+
+    return "\nReveal.initialize({\n%s\n});\n" % indent(
+        ",\n".join(f"{name}: {value}" for name, value in options), "  "
+    )
@@ -0,0 +1,317 @@
+"""sphinxcontrib.revealjs.serviceworker
+
+Generate a service worker that precaches the files each deck needs, so decks
+load from the cache on repeat visits and can be presented offline.
+
+Static files shared by every deck are precached when the service worker is
+installed. A deck's own files (its page, plugins and images) are precached
+when the deck is opened, so visiting one deck doesn't download the whole
+site.
+
+Each file in the precache manifest has a revision hashed from its contents.
+Files whose size and modification time haven't changed since the last build
+keep their revision without being hashed again. The service worker only
+downloads files whose revision changed, so unchanged assets keep their cache
+entries across deploys.
+
+Contents:
+    - build_manifest
+    - write_service_worker
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from os import path
+
+import hashlib
+import json
+import os
+import pickle
+
+from sphinx.application import Sphinx
+from sphinx.util import logging, progress_message
+
+from .builder import RevealJSBuilder
+from .outputs import write_if_changed
+
+logger = logging.getLogger(__name__)
+
+SERVICE_WORKER_FILENAME = "sw.js"
+MANIFEST_FILENAME = "precache-manifest.json"
+
+#: Files that are never precached.
+EXCLUDED_FILES = {
+    SERVICE_WORKER_FILENAME,
+    MANIFEST_FILENAME,
+    ".buildinfo",
+    "objects.inv",
+}
+EXCLUDED_SUFFIXES = (".gz", ".br")
+
+SERVICE_WORKER = """\
+/* Generated by sphinxcontrib-revealjs; precaches the files of each deck. */
+const VERSION = "%(version)s";
+const MANIFEST = %(manifest)s;
+const CACHE = "revealjs-precache";
+
+function resolve(url) {
+  return new URL(url, self.registration.scope).href;
+}
+
+function cacheKey(url, revision) {
+  const key = new URL(url, self.registration.scope);
+  key.searchParams.set("__revision", revision);
+  return key.href;
+}
+
+function normalize(href) {
+  const url = new URL(href);
+  url.hash = "";
+  url.search = "";
+  if (url.pathname.endsWith("/")) {
+    url.pathname += "index.html";
+  }
+  return url.href;
+}
+
+const KEYS = new Map(
+  [MANIFEST.shared, ...Object.values(MANIFEST.decks)]
+    .flat()
+    .map(([url, revision]) => [resolve(url), cacheKey(url, revision)])
+);
+const DECKS = new Map(
+  Object.entries(MANIFEST.decks).map(([page, files]) => [resolve(page), files])
+);
+
+async function precache(files) {
+  const cache = await caches.open(CACHE);
+  const cached = new Set((await cache.keys()).map((request) => request.url));
+
+  // One missing file shouldn't stop the others from being cached.
+  const results = await Promise.allSettled(
+    files.map(async ([url, revision]) => {
+      const key = cacheKey(url, revision);
+      if (cached.has(key)) {
+        return;
+      }
+
+      const response = await fetch(new Request(url, { cache: "reload" }));
+      if (!response.ok) {
+        throw new Error(`could not precache ${url}: ${response.status}`);
+      }
+      await cache.put(key, response);
+    })
+  );
+  for (const result of results) {
+    if (result.status === "rejected") {
+      console.warn(result.reason);
+    }
+  }
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(precache(MANIFEST.shared).then(() => self.skipWaiting()));
+});
+
+// Pages send their URL once the service worker is active.
+self.addEventListener("message", (event) => {
+  const files = event.data && DECKS.get(normalize(event.data.precache));
+  if (files) {
+    event.waitUntil(precache(files));
+  }
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    (async () => {
+      const cache = await caches.open(CACHE);
+      const current = new Set(KEYS.values());
+
+      for (const request of await cache.keys()) {
+        if (!current.has(request.url)) {
+          await cache.delete(request);
+        }
+      }
+
+      await self.clients.claim();
+    })()
+  );
+});
+
+self.addEventListener("fetch", (event) => {
+  if (event.request.method !== "GET") {
+    return;
+  }
+
+  const key = KEYS.get(normalize(event.request.url));
+  if (key) {
+    event.respondWith(
+      caches
+        .open(CACHE)
+        .then((cache) => cache.match(key))
+        .then((response) => response || fetch(event.request))
+    );
+  }
+});
+"""
+
+#: url -> (size, mtime_ns, revision)
+RevisionCache = Dict[str, Tuple[int, int, str]]
+
+#: {"shared": [(url, revision)], "decks": {page: [(url, revision)]}}
+Manifest = Dict[str, Any]
+
+
+def hash_file(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()[:16]
+
+
+def _revision(
+    outdir: str,
+    url: str,
+    previous: RevisionCache,
+    revisions: RevisionCache,
+) -> Optional[str]:
+    if url in revisions:
+        return revisions[url][2]
+
+    fullpath = path.join(outdir, url)
+    try:
+        stat = os.stat(fullpath)
+    except OSError:
+        return None
+
+    cached = previous.get(url)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        revision = cached[2]
+    else:
+        revision = hash_file(fullpath)
+
+    revisions[url] = (stat.st_size, stat.st_mtime_ns, revision)
+    return revision
+
+
+def _shared_files(outdir: str) -> List[str]:
+    """Return the static files every deck may use.
+
+    Plugins are left out, since each deck lists the plugins it loads.
+    """
+
+    static_dir = path.join(outdir, "_static")
+    files = []
+
+    for dirpath, dirnames, filenames in os.walk(static_dir):
+        dirnames[:] = sorted(
+            d
+            for d in dirnames
+            if not d.startswith(".")
+            and path.join(dirpath, d) != path.join(static_dir, "plugin")
+        )
+
+        for filename in filenames:
+            if filename in EXCLUDED_FILES or filename.endswith(
+                EXCLUDED_SUFFIXES
+            ):
+                continue
+
+            fullpath = path.join(dirpath, filename)
+            files.append(path.relpath(fullpath, outdir).replace(os.sep, "/"))
+
+    return files
+
+
+def build_manifest(
+    outdir: str,
+    decks: Dict[str, List[str]],
+    previous: Optional[RevisionCache] = None,
+) -> Tuple[Manifest, RevisionCache]:
+    """Return the precache manifest of ``outdir`` and its revision cache.
+
+    ``decks`` maps each deck's page to the files it uses, relative to
+    ``outdir``. The manifest has the ``shared`` static files and the files
+    of each deck, as sorted lists of ``(url, revision)``; files that don't
+    exist are left out. ``previous`` is the revision cache returned by the
+    last call; files whose size and modification time match it aren't
+    hashed again.
+    """
+
+    previous = previous or {}
+    revisions: RevisionCache = {}
+
+    def entries(urls: List[str]) -> List[Tuple[str, str]]:
+        return sorted(
+            (url, revision)
+            for url, revision in (
+                (url, _revision(outdir, url, previous, revisions))
+                for url in set(urls)
+            )
+            if revision is not None
+        )
+
+    manifest: Manifest = {
+        "shared": entries(_shared_files(outdir)),
+        "decks": {
+            page: entries([page] + files)
+            for page, files in sorted(decks.items())
+        },
+    }
+    return manifest, revisions
+
+
+def write_service_worker(app: Sphinx, exception: Optional[Exception]) -> None:
+    """Write the service worker and precache manifest after a build."""
+
+    if (
+        exception
+        or not isinstance(app.builder, RevealJSBuilder)
+        or not app.config.revealjs_service_worker
+    ):
+        return
+
+    cache_path = path.join(app.doctreedir, "revealjs-precache.pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            previous = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        previous = {}
+
+    builder = app.builder
+    decks = {
+        path.relpath(builder.get_outfilename(docname), app.outdir).replace(
+            os.sep, "/"
+        ): files
+        for docname, files in builder.deck_files.items()
+    }
+
+    with progress_message("writing service worker"):
+        manifest, revisions = build_manifest(app.outdir, decks, previous)
+        manifest_json = json.dumps(manifest, indent=1)
+        version = hashlib.sha256(manifest_json.encode()).hexdigest()[:16]
+
+        write_if_changed(
+            path.join(app.outdir, MANIFEST_FILENAME),
+            json.dumps(dict(manifest, version=version), indent=1),
+        )
+        write_if_changed(
+            path.join(app.outdir, SERVICE_WORKER_FILENAME),
+            SERVICE_WORKER % {"version": version, "manifest": manifest_json},
+        )
+
+    with open(cache_path, "wb") as f:
+        pickle.dump(revisions, f, pickle.HIGHEST_PROTOCOL)
+
+    changed = sum(
+        1
+        for url, (_, _, revision) in revisions.items()
+        if previous.get(url, (None, None, None))[2] != revision
+    )
+    logger.info(
+        "precache manifest: %d shared files, %d decks, %d files changed",
+        len(manifest["shared"]),
+        len(manifest["decks"]),
+        changed,
+    )
@@ -0,0 +1,245 @@
+"""Slide performance telemetry collector and report.
+
+Decks built with ``revealjs_telemetry`` set load a script that records, for
+each slide, how long its transitions take, long tasks while it's shown and
+how long its images take to decode, and sends them to the configured
+endpoint. This module is a small collector for those samples, which appends
+them to a JSON Lines file, and a report that ranks the heaviest slides of
+each deck.
+
+Usage::
+
+    $ python -m sphinxcontrib.revealjs.telemetry collect --port 8765
+    $ python -m sphinxcontrib.revealjs.telemetry report --top 5
+
+Contents:
+    - SlideStats
+    - TelemetryServer
+    - read_samples
+    - summarize
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import argparse
+import json
+import statistics
+import threading
+import time
+
+#: Largest request body the collector accepts, in bytes.
+MAX_BODY_SIZE = 2**16
+
+SAMPLE_KINDS = ("transition", "longtask", "decode")
+
+
+class SlideStats(NamedTuple):
+    deck: str
+    slide: str
+    #: Number of transitions to the slide.
+    views: int
+    #: Median and slowest transition, in milliseconds.
+    transition_p50: float
+    transition_max: float
+    #: Number and total duration of long tasks while the slide was shown.
+    long_tasks: int
+    long_task_ms: float
+    #: Slowest image decode, in milliseconds.
+    decode_max: float
+
+    @property
+    def cost(self) -> float:
+        """Milliseconds the slide typically blocks for when it's shown."""
+
+        return (
+            self.transition_p50
+            + self.long_task_ms / max(self.views, 1)
+            + self.decode_max
+        )
+
+
+def _valid_samples(payload: Any) -> List[Dict[str, Any]]:
+    if not isinstance(payload, dict) or not isinstance(
+        payload.get("samples"), list
+    ):
+        raise ValueError("expected {deck, samples}")
+
+    deck = str(payload.get("deck", ""))
+    received = time.time()
+    samples = []
+    for sample in payload["samples"]:
+        if (
+            isinstance(sample, dict)
+            and sample.get("kind") in SAMPLE_KINDS
+            and isinstance(sample.get("value"), (int, float))
+            and sample.get("slide")
+        ):
+            samples.append(
+                {
+                    "deck": deck,
+                    "slide": str(sample["slide"]),
+                    "kind": sample["kind"],
+                    "value": float(sample["value"]),
+                    "received": received,
+                }
+            )
+
+    return samples
+
+
+class TelemetryServer(ThreadingHTTPServer):
+    """HTTP server that appends posted samples to ``filename``."""
+
+    def __init__(self, address: Any, filename: str) -> None:
+        self.filename = filename
+        self.lock = threading.Lock()
+        super().__init__(address, TelemetryHandler)
+
+    def append(self, samples: List[Dict[str, Any]]) -> None:
+        with self.lock, open(self.filename, "a", encoding="utf-8") as f:
+            for sample in samples:
+                f.write(json.dumps(sample, sort_keys=True) + "\n")
+
+
+class TelemetryHandler(BaseHTTPRequestHandler):
+    server: TelemetryServer
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def send_empty(self, code: int) -> None:
+        self.send_response(code)
+        # Decks are usually served from another origin than the collector.
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_OPTIONS(self) -> None:
+        self.send_empty(204)
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.send_empty(411)
+            return
+
+        if length > MAX_BODY_SIZE:
+            self.send_empty(413)
+            return
+
+        try:
+            samples = _valid_samples(json.loads(self.rfile.read(length)))
+        except ValueError:
+            self.send_empty(400)
+            return
+
+        self.server.append(samples)
+        self.send_empty(204)
+
+
+def read_samples(filename: str) -> Iterator[Dict[str, Any]]:
+    """Yield the samples collected in ``filename``, skipping bad lines."""
+
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize(
+    samples: Iterable[Dict[str, Any]],
+) -> Dict[str, List[SlideStats]]:
+    """Return each deck's slides, heaviest first."""
+
+    values: Dict[tuple, Dict[str, List[float]]] = {}
+    for sample in samples:
+        key = (sample["deck"], sample["slide"])
+        values.setdefault(key, {kind: [] for kind in SAMPLE_KINDS})[
+            sample["kind"]
+        ].append(sample["value"])
+
+    decks: Dict[str, List[SlideStats]] = {}
+    for (deck, slide), kinds in values.items():
+        transitions = kinds["transition"]
+        decks.setdefault(deck, []).append(
+            SlideStats(
+                deck,
+                slide,
+                len(transitions),
+                statistics.median(transitions) if transitions else 0.0,
+                max(transitions, default=0.0),
+                len(kinds["longtask"]),
+                sum(kinds["longtask"]),
+                max(kinds["decode"], default=0.0),
+            )
+        )
+
+    for slides in decks.values():
+        slides.sort(key=lambda s: s.cost, reverse=True)
+
+    return decks
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinxcontrib.revealjs.telemetry",
+        description="Collect and report slide performance telemetry.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    collect_parser = commands.add_parser(
+        "collect", help="collect samples sent by decks"
+    )
+    collect_parser.add_argument("--host", default="127.0.0.1")
+    collect_parser.add_argument("--port", type=int, default=8765)
+    collect_parser.add_argument("--output", default="telemetry.jsonl")
+
+    report_parser = commands.add_parser(
+        "report", help="rank the heaviest slides of each deck"
+    )
+    report_parser.add_argument("input", nargs="?", default="telemetry.jsonl")
+    report_parser.add_argument(
+        "--top", type=int, default=10, help="slides to show per deck"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "collect":
+        server = TelemetryServer((args.host, args.port), args.output)
+        print(
+            f"collecting telemetry on http://{args.host}:{args.port} "
+            f"into {args.output}"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    elif args.command == "report":
+        for deck, slides in sorted(
+            summarize(read_samples(args.input)).items()
+        ):
+            print(deck)
+            print(
+                f"  {'slide':<32} {'cost ms':>8} {'views':>6} "
+                f"{'p50 ms':>7} {'max ms':>7} {'long':>5} {'long ms':>8} "
+                f"{'decode':>7}"
+            )
+            for s in slides[: args.top]:
+                print(
+                    f"  {s.slide:<32} {s.cost:>8.0f} {s.views:>6} "
+                    f"{s.transition_p50:>7.0f} {s.transition_max:>7.0f} "
+                    f"{s.long_tasks:>5} {s.long_task_ms:>8.0f} "
+                    f"{s.decode_max:>7.0f}"
+                )
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
 """sphinxcontrib.revealjs.transforms"""
 
+from typing import Callable, List, Optional
+from os import path
+
+import hashlib
+
+from sphinx import addnodes as sphinx_addnodes
 from sphinx.application import Sphinx
+from sphinx.errors import ExtensionError
+from sphinx.util import logging
 from docutils import nodes
 
 from . import addnodes
+from .assets import note_slide_asset
+from .builder import RevealJSBuilder
+
+logger = logging.getLogger(__name__)
 
 
 def migrate_transitions_to_newslides(
@@ -15,15 +27,81 @@ def migrate_transitions_to_newslides(
     transition` is `True`.
     """
 
-    if not app.config.revealjs_break_on_transition:
+    if not app.config.revealjs_break_on_transition or doctree.get(
+        "revealjs_deck"
+    ):
         return
 
     for node in doctree.traverse(nodes.transition):
         node.replace_self(addnodes.newslide("", localtitle=""))
 
 
+def compact_slide_nodes(app: Sphinx, doctree: nodes.document) -> None:
+    """Drop duplicate source text from slides and speaker notes.
+
+    Text nodes keep a copy of the source they were parsed from, which is
+    pickled with the doctree but never used. This only happens if the
+    config value, ``revealjs_compact_doctrees`` is ``True``.
+    """
+
+    # Nodes of decks generated from data have no source text.
+    if not app.config.revealjs_compact_doctrees or doctree.get(
+        "revealjs_deck"
+    ):
+        return
+
+    for node in doctree.traverse(
+        lambda node: isinstance(node, (addnodes.Slide, addnodes.speakernote))
+    ):
+        node.rawsource = ""
+        for text in node.traverse(nodes.Text):
+            text.rawsource = ""
+
+
+def note_theme_assets(app: Sphinx, doctree: nodes.document) -> None:
+    """Record the RevealJS theme as a dependency of every deck."""
+
+    if isinstance(app.builder, RevealJSBuilder):
+        for asset in app.builder.get_theme_assets():
+            note_slide_asset(app.env, asset)
+
+
+def set_slide_id(doctree: nodes.document, section: nodes.section) -> None:
+    """Give a slide made by a newslide an id derived from its contents.
+
+    Ids from ``doctree.set_id`` come from a counter, so they change whenever
+    an id is generated earlier in the document. Unlike those, this id only
+    changes when the slide's title or text does.
+    """
+
+    if section["ids"]:
+        doctree.set_id(section)
+        return
+
+    digest = hashlib.sha1(section.astext().encode("utf-8")).hexdigest()[:8]
+    base = f"{nodes.make_id(section[0].astext()) or 'slide'}-{digest}"
+
+    slide_id = base
+    count = 1
+    while slide_id in doctree.ids:
+        count += 1
+        slide_id = f"{base}-{count}"
+
+    section["ids"].append(slide_id)
+    doctree.ids[slide_id] = section
+
+
 def process_newslides(app: Sphinx, doctree: nodes.document, _) -> None:
-    """Process newslides after doctree is resolved."""
+    """Process newslides after doctree is resolved.
+
+    Decks generated from data (see ``decks``) are already split into
+    slides, so they're skipped.
+    """
+
+    if doctree.get("revealjs_deck"):
+        return
+
+    new_sections: List[nodes.section] = []
 
     while doctree.traverse(addnodes.newslide):
         newslide_node = doctree.next_node(addnodes.newslide)
@@ -48,16 +126,146 @@ def process_newslides(app: Sphinx, doctree: nodes.document, _) -> None:
 
         new_section = nodes.section("")
         new_section.attributes = newslide_node.attributes
-        doctree.set_id(new_section)
+        new_sections.append(new_section)
 
         new_section += nodes.title("", title)
 
+        # Move the nodes instead of copying them; they're removed from
+        # parent_section anyway.
         for next_node in parent_section[
             parent_section.index(newslide_node) + 1 :
         ]:
-            new_section.append(next_node.deepcopy())
             parent_section.remove(next_node)
+            new_section.append(next_node)
 
         chapter = parent_section.parent
         chapter.insert(chapter.index(parent_section) + 1, new_section)
         parent_section.remove(newslide_node)
+
+    # Set ids once every slide has been split off, so they only depend on
+    # their own slide's contents.
+    for new_section in new_sections:
+        set_slide_id(doctree, new_section)
+
+
+def _prune_condition(name: str) -> Callable[[nodes.Node], bool]:
+    """Return a ``traverse`` condition matching nodes named by ``name``.
+
+    ``name`` is looked up in ``sphinx.addnodes`` first, then in
+    ``docutils.nodes``, so it may name a concrete node (``glossary``) or a
+    node category (``Admonition``). By the time the doctree is resolved,
+    ``toctree`` nodes have been replaced by their ``toctree-wrapper``
+    compound, so ``"toctree"`` matches that wrapper as well.
+    """
+
+    node_class = getattr(sphinx_addnodes, name, None) or getattr(
+        nodes, name, None
+    )
+    if not isinstance(node_class, type):
+        raise ExtensionError(
+            f"revealjs_prune_nodes: {name!r} is not a docutils or Sphinx node"
+        )
+
+    if node_class is sphinx_addnodes.toctree:
+        return lambda node: isinstance(node, sphinx_addnodes.toctree) or (
+            isinstance(node, nodes.compound)
+            and "toctree-wrapper" in node["classes"]
+        )
+
+    return lambda node: isinstance(node, node_class)
+
+
+def prune_doctree(app: Sphinx, doctree: nodes.document, docname: str) -> None:
+    """Remove nodes that the revealjs writer never renders.
+
+    This runs after newslides are processed, so image collection and
+    translation work on the smaller tree. Node types to remove are listed in
+    the config value, ``revealjs_prune_nodes``.
+    """
+
+    if not isinstance(app.builder, RevealJSBuilder):
+        return
+
+    conditions = [
+        _prune_condition(name) for name in app.config.revealjs_prune_nodes
+    ]
+    if not conditions:
+        return
+
+    def condition(node: nodes.Node) -> bool:
+        return any(matches(node) for matches in conditions)
+
+    pruned_nodes = pruned_bytes = 0
+    removed = set()
+    for node in list(doctree.traverse(condition)):
+        # Skip nodes inside a subtree that's already been removed.
+        ancestor = node.parent
+        while ancestor is not None and id(ancestor) not in removed:
+            ancestor = ancestor.parent
+        if ancestor is not None:
+            continue
+
+        removed.add(id(node))
+        pruned_nodes += len(list(node.traverse()))
+        pruned_bytes += len(node.astext().encode("utf-8"))
+        node.parent.remove(node)
+
+    if pruned_nodes:
+        app.builder.pruned[docname] = (pruned_nodes, pruned_bytes)
+        logger.verbose(
+            "%s: pruned %d nodes (%d bytes)",
+            docname,
+            pruned_nodes,
+            pruned_bytes,
+        )
+
+
+def vendor_remote_assets(
+    app: Sphinx, doctree: nodes.document, docname: str
+) -> None:
+    """Replace remote images and background images with cached copies.
+
+    This runs after the doctree is pruned, so assets of pruned nodes aren't
+    downloaded.
+
+    Cached copies are registered as images of ``docname``, so they're copied
+    to the builder's image directory like local images.
+    """
+
+    builder = app.builder
+    if not (isinstance(builder, RevealJSBuilder) and builder.vendor_cache):
+        return
+
+    def vendor(url: str, node: nodes.Node) -> Optional[str]:
+        try:
+            return builder.vendor_cache.get(url)
+        except OSError as err:
+            logger.warning(
+                "cannot vendor remote asset %s: %s", url, err, location=node
+            )
+            return None
+
+    for node in doctree.traverse(nodes.image):
+        if "://" not in node["uri"]:
+            continue
+
+        filename = vendor(node["uri"], node)
+        if filename:
+            app.env.images.add_file(docname, filename)
+            node.setdefault("alt", node["uri"])
+            node["uri"] = filename
+            node["candidates"] = {"*": filename}
+
+    for node in doctree.traverse(nodes.Element):
+        bg_image = node.get("data-background-image")
+        if not bg_image or "://" not in bg_image:
+            continue
+
+        filename = vendor(bg_image, node)
+        if filename:
+            builder.images[filename] = app.env.images.add_file(
+                docname, filename
+            )
+            node["data-background-image"] = path.join(
+                builder.imagedir, builder.images[filename]
+            )
@@ -0,0 +1,179 @@
+"""sphinxcontrib.revealjs.vendor
+
+Download remote slide assets into a local, content-addressed cache, so decks
+don't depend on third-party hosts while they're presented.
+
+Assets are fetched through a pluggable fetcher. Cached assets are reused
+until they're older than the cache's ``max_age``; then they're revalidated
+with a conditional request (``If-None-Match``/``If-Modified-Since``), so
+unchanged assets aren't downloaded again.
+
+Contents:
+    - FetchResult
+    - urllib_fetcher
+    - AssetCache
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional
+from os import path
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+import hashlib
+import json
+import mimetypes
+import os
+import time
+
+from sphinx.util import logging
+from sphinx.util.osutil import ensuredir
+
+logger = logging.getLogger(__name__)
+
+
+class FetchResult(NamedTuple):
+    """Response to a fetch; ``body`` is ignored unless ``status`` is 200."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+#: Takes a URL and request headers, and returns a ``FetchResult``.
+Fetcher = Callable[[str, Dict[str, str]], FetchResult]
+
+
+def urllib_fetcher(
+    url: str, headers: Dict[str, str], timeout: float = 30
+) -> FetchResult:
+    """Fetch ``url`` with ``urllib``."""
+
+    request = Request(
+        url, headers={"User-Agent": "sphinxcontrib-revealjs", **headers}
+    )
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return FetchResult(
+                response.status, dict(response.headers), response.read()
+            )
+    except HTTPError as err:
+        if err.code == 304:
+            return FetchResult(304, dict(err.headers))
+        raise
+
+
+class AssetCache:
+    """Content-addressed cache of remote assets.
+
+    Assets are stored as ``objects/<sha256><extension>`` in ``directory``,
+    and ``index.json`` maps each URL to its object and validators.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fetcher: Optional[Fetcher] = None,
+        max_age: float = 86400,
+    ) -> None:
+        self.directory = directory
+        self.fetcher = fetcher or urllib_fetcher
+        self.max_age = max_age
+        self.index: Dict[str, Dict] = {}
+
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def index_path(self) -> str:
+        return path.join(self.directory, "index.json")
+
+    def object_path(self, entry: Dict) -> str:
+        return path.join(
+            self.directory, "objects", entry["digest"] + entry["extension"]
+        )
+
+    def save(self) -> None:
+        ensuredir(self.directory)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, url: str) -> str:
+        """Return the path of the cached copy of ``url``.
+
+        Fetches or revalidates ``url`` if needed. If that fails but a stale
+        copy is cached, the stale copy is used.
+        """
+
+        entry = self.index.get(url)
+        if entry and not path.exists(self.object_path(entry)):
+            entry = None
+
+        if entry and time.time() - entry["fetched"] < self.max_age:
+            return self.object_path(entry)
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            result = self.fetcher(url, headers)
+            # Fetchers return errors as statuses; urllib raises them.
+            if not (result.status == 200 or result.status == 304 and entry):
+                raise OSError(f"cannot fetch {url}: HTTP {result.status}")
+        except OSError as err:
+            if entry:
+                logger.warning(
+                    "cannot revalidate %s; using cached copy: %s", url, err
+                )
+                return self.object_path(entry)
+            raise
+
+        response_headers = {
+            name.lower(): value for name, value in result.headers.items()
+        }
+
+        if result.status == 304:
+            entry["fetched"] = time.time()
+        else:
+            entry = self.store(url, result.body, response_headers)
+
+        entry["etag"] = response_headers.get("etag", entry.get("etag"))
+        entry["last_modified"] = response_headers.get(
+            "last-modified", entry.get("last_modified")
+        )
+        self.index[url] = entry
+        self.save()
+
+        return self.object_path(entry)
+
+    def store(self, url: str, body: bytes, headers: Dict[str, str]) -> Dict:
+        """Store ``body`` by its hash and return its index entry."""
+
+        extension = path.splitext(urlsplit(url).path)[1].lower()
+        if not extension:
+            content_type = headers.get("content-type", "").split(";")[0]
+            extension = mimetypes.guess_extension(content_type.strip()) or ""
+
+        entry = {
+            "digest": hashlib.sha256(body).hexdigest(),
+            "extension": extension,
+            "fetched": time.time(),
+        }
+
+        object_path = self.object_path(entry)
+        if not path.exists(object_path):
+            ensuredir(path.dirname(object_path))
+            tmp_path = object_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, object_path)
+
+        return entry
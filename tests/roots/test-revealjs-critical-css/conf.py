@@ -0,0 +1,10 @@
+extensions = ["sphinxcontrib.revealjs"]
+html_sidebars = {"**": []}
+html_domain_indices = False
+html_use_index = False
+
+html_static_path = ["_static"]
+html_css_files = ["custom.css"]
+
+revealjs_critical_css = True
+revealjs_critical_css_slides = 2
@@ -0,0 +1 @@
+window.RevealHello = { id: "hello", init: function () {} };
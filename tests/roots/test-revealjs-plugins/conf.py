@@ -0,0 +1,18 @@
+extensions = ["sphinxcontrib.revealjs"]
+html_sidebars = {"**": []}
+html_domain_indices = False
+html_use_index = False
+
+revealjs_plugins = [
+    "notes",
+    "highlight",
+    "zoom",
+    {
+        "name": "hello",
+        "path": "_plugins/hello",
+        "scripts": ["hello.js"],
+        "init": "RevealHello",
+        "options": {"hello": "'world'"},
+        "nodes": ["math_block"],
+    },
+]
@@ -0,0 +1,4 @@
+extensions = ["sphinxcontrib.revealjs"]
+html_sidebars = {"**": []}
+html_domain_indices = False
+html_use_index = False
@@ -1,8 +1,17 @@
+import os
+import pickle
 import re
+import shutil
+import time
 from itertools import chain, cycle
 
 from html5lib import HTMLParser
 import pytest
+from sphinx.application import Sphinx
+
+from sphinxcontrib.revealjs.assets import get_asset_docnames
+from sphinxcontrib.revealjs.doctreestats import measure_doctrees
+from sphinxcontrib.revealjs.outputs import snapshot
 
 etree_cache = {}
 
@@ -81,6 +90,26 @@ def test_revealjs_translator(app, cached_etree_parse, fname, expect):
         check_xpath(cached_etree_parse(app.outdir / fname), fname, *expect)
 
 
+@pytest.mark.sphinx(buildername="revealjs", testroot="builder-revealjs")
+def test_revealjs_prune_nodes(app):
+    app.build(force_all=True)
+
+    pruned_nodes, pruned_bytes = app.builder.pruned["index"]
+    assert pruned_nodes > 0
+    assert pruned_bytes > 0
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="builder-revealjs",
+    confoverrides={"revealjs_prune_nodes": []},
+)
+def test_revealjs_prune_nodes_disabled(app):
+    app.build(force_all=True)
+
+    assert app.builder.pruned == {}
+
+
 @pytest.mark.parametrize(
     "fname,expect",
     flat_dict(
@@ -138,6 +167,288 @@ def test_revealjs_build_vertical_slides(
     check_xpath(cached_etree_parse(app.outdir / fname), fname, *expect)
 
 
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-assets")
+def test_revealjs_slide_assets(app):
+    app.build()
+
+    assert "img/bg.png" in app.env.dependencies["index"]
+    assert get_asset_docnames(app.env)["img/bg.png"] == {"index"}
+    assert (app.outdir / "_images/img/bg.png").exists()
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-assets")
+def test_revealjs_slide_assets_copied_without_reread(app):
+    app.build()
+    (app.outdir / "_images/img/bg.png").unlink()
+
+    app.builder.images.clear()
+    app.build(force_all=True)
+
+    assert (app.outdir / "_images/img/bg.png").exists()
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-assets")
+def test_revealjs_slide_assets_changed(app):
+    app.build()
+    mtime = time.time() + 10
+
+    os.utime(app.srcdir / "index.rst", (mtime, mtime))
+    app._status.seek(0)
+    app._status.truncate()
+    app.build()
+
+    assert "slide asset img/bg.png changed" not in app._status.getvalue()
+
+    os.utime(app.srcdir / "img/bg.png", (mtime + 10, mtime + 10))
+    app.build()
+
+    assert "slide asset img/bg.png changed" in app._status.getvalue()
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-critical-css")
+def test_revealjs_critical_css(app):
+    app.build()
+
+    content = (app.outdir / "index.html").read_text()
+    critical_css = content[
+        content.index("<style>") : content.index("</style>")
+    ]
+
+    assert ".reveal h1{" in critical_css
+    assert "@media (max-width: 600px){.reveal h2{" in critical_css
+    assert ".reveal a:hover{" in critical_css
+    assert 'url("_static/fonts/slides.woff2")' in critical_css
+    assert "@import" not in critical_css
+    assert "not-on-first-slides" not in critical_css
+    assert "late-slide" not in critical_css
+    assert 'href="_static/custom.css"\n' in content
+    assert 'rel="preload"' in content
+    assert "<noscript>" in content
+
+
+@pytest.mark.parametrize("parallel", [0, 4])
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-critical-css")
+def test_revealjs_critical_css_cache(make_app, app_params, parallel):
+    args, kwargs = app_params
+    app = make_app(*args, freshenv=True, parallel=parallel, **kwargs)
+    app.build(force_all=True)
+
+    with open(app.builder.critical_css_path, "rb") as f:
+        cache = pickle.load(f)
+
+    assert len(cache) == len(app.env.all_docs) == 3
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="builder-revealjs",
+    confoverrides={
+        "revealjs_multiplex": {
+            "url": "ws://localhost:1948",
+            "secret": "secret",
+        },
+        "revealjs_multiplex_master": True,
+        "revealjs_precompress": True,
+    },
+)
+def test_revealjs_multiplex(app):
+    app.build(force_all=True)
+
+    follower = (app.outdir / "index.html").read_text()
+    master = (app.outdir / "index-master.html").read_text()
+
+    assert '"id": "2bb80d537b1da3e3"' in follower
+    assert "secret" not in follower
+    assert '"secret": "secret"' in master
+    assert "plugins: [RevealNotes, RevealMultiplex]" in master
+
+    # Master variants hold the secret, so they aren't compressed or listed.
+    assert (app.outdir / "index.html.gz").exists()
+    assert not (app.outdir / "index-master.html.gz").exists()
+    assert "index-master.html" not in app.builder.outputs_changed
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="builder-revealjs",
+    srcdir="revealjs-multiplex-master",
+    confoverrides={
+        "revealjs_multiplex": {
+            "url": "ws://localhost:1948",
+            "secret": "secret",
+        },
+    },
+)
+def test_revealjs_multiplex_master_opt_in(make_app, app_params, app):
+    (app.srcdir / "team-master.rst").write_text("Team\n====\n")
+    app.build(force_all=True)
+
+    # Without the opt-in, no page gets the secret.
+    assert not (app.outdir / "index-master.html").exists()
+    assert app.builder.master_pages == {}
+    # Only pages the builder wrote as master variants are left out.
+    assert "team-master.html" in app.builder.outputs_changed
+
+    args, kwargs = app_params
+    confoverrides = dict(
+        kwargs["confoverrides"], revealjs_multiplex_master=True
+    )
+    app = make_app(*args, **dict(kwargs, confoverrides=confoverrides))
+    app.build()
+    assert app.builder.master_pages["index"] == "index-master.html"
+    assert (app.outdir / "index-master.html").exists()
+
+    # Turning it off again removes the master pages.
+    app = make_app(*args, **kwargs)
+    app.build()
+    assert not (app.outdir / "index-master.html").exists()
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-plugins")
+def test_revealjs_plugins(app):
+    app.build(force_all=True)
+
+    index = (app.outdir / "index.html").read_text()
+    other = (app.outdir / "other.html").read_text()
+
+    assert "_static/plugin/highlight/highlight.js" in index
+    assert "_static/plugin/hello/hello.js" in index
+    assert "_static/plugin/notes/notes.js" not in index
+    assert "hello: 'world'" in index
+    assert "plugins: [RevealHighlight, RevealZoom, RevealHello]" in index
+
+    assert "_static/plugin/notes/notes.js" in other
+    assert "highlight" not in other
+    assert "plugins: [RevealNotes, RevealZoom]" in other
+
+    assert app.builder.deck_plugins == {
+        "index": ["highlight", "zoom", "hello"],
+        "other": ["notes", "zoom"],
+    }
+
+    app.builder.copy_revealjs_plugins()
+    assert (app.outdir / "_static/plugin/hello/hello.js").exists()
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-plugins")
+def test_revealjs_plugins_rebuild(app):
+    app.build(force_all=True)
+    app.build(force_all=True)
+
+    other = (app.outdir / "other.html").read_text()
+
+    assert other.count("_static/plugin/notes/notes.js") == 1
+    assert other.count("Reveal.initialize") == 1
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="revealjs-plugins",
+    confoverrides={"revealjs_plugins": ["zoom"]},
+)
+def test_revealjs_plugins_unused_not_copied(app):
+    app.build(force_all=True)
+
+    index = (app.outdir / "index.html").read_text()
+
+    assert "plugins: [RevealZoom]" in index
+    assert "notes.js" not in index
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="builder-revealjs",
+    confoverrides={"revealjs_telemetry": "https://example.com/collect"},
+)
+def test_revealjs_telemetry(app):
+    app.build(force_all=True)
+
+    index = (app.outdir / "index.html").read_text()
+
+    assert (
+        'data-endpoint="https://example.com/collect" '
+        'src="_static/plugin/telemetry/telemetry.js"'
+    ) in index
+    assert index.index("telemetry.js") < index.index("Reveal.initialize")
+
+    app.builder.copy_telemetry_script()
+    assert (app.outdir / "_static/plugin/telemetry/telemetry.js").exists()
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="builder-revealjs")
+def test_revealjs_newslide_ids(app):
+    app.build(force_all=True)
+
+    index = (app.outdir / "index.html").read_text()
+
+    assert re.search(r'id="heading-2-2-1-[0-9a-f]{8}"', index)
+    assert not re.search(r'id="id[0-9]+"', index)
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="builder-revealjs")
+def test_revealjs_write_if_changed(app):
+    app.build(force_all=True)
+    before = snapshot(app.outdir)
+
+    app.build(force_all=True)
+
+    assert app.builder.outputs_changed == []
+    assert snapshot(app.outdir) == before
+
+    (app.outdir / "index.html").write_text("stale")
+    app.build(force_all=True)
+
+    assert app.builder.outputs_changed == ["index.html"]
+
+
+def test_revealjs_outputs_skip_default_doctreedir(rootdir, tmp_path):
+    srcdir = tmp_path / "src"
+    shutil.copytree(rootdir / "test-builder-revealjs", srcdir)
+    outdir = tmp_path / "out"
+
+    # Like sphinx-build without -d, so doctrees are written to the outdir.
+    for _ in range(2):
+        app = Sphinx(
+            str(srcdir),
+            str(srcdir),
+            str(outdir),
+            str(outdir / ".doctrees"),
+            "revealjs",
+            status=None,
+            warning=None,
+        )
+        app.build()
+
+    assert app.builder.outputs_changed == []
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="builder-revealjs")
+def test_revealjs_touched_source_written_once(app):
+    app.build()
+    os.utime(app.srcdir / "index.rst")
+
+    assert list(app.builder.get_outdated_docs()) == ["index"]
+    app.build()
+
+    # The page didn't change, so it kept its old modification time.
+    assert app.builder.outputs_changed == []
+    assert list(app.builder.get_outdated_docs()) == []
+
+
+@pytest.mark.parametrize("compact", [True, False])
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-assets")
+def test_revealjs_compact_doctrees(make_app, app_params, compact):
+    args, kwargs = app_params
+    kwargs["confoverrides"] = {"revealjs_compact_doctrees": compact}
+    app = make_app(*args, freshenv=True, **kwargs)
+    app.build()
+
+    stats = {s.docname: s for s in measure_doctrees(app.doctreedir)}
+
+    assert stats["index"].slide_nodes == 1
+    assert (stats["index"].slide_rawsource == 0) == compact
+
+
 # Code below is copied from https://github.com/sphinx-doc/sphinx/blob/9e1b4a8f1678e26670d34765e74edf3a3be3c62c/tests/test_build_html.py
 
 
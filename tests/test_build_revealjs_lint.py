@@ -0,0 +1,43 @@
+import pytest
+
+from sphinxcontrib.revealjs.directives import optional_csscolorvalue
+
+
+@pytest.mark.parametrize(
+    "color",
+    ["red", "RebeccaPurple", "#fff", "#00ff0080", "rgb(0, 0, 0)", "var(--x)"],
+)
+def test_optional_csscolorvalue(color):
+    assert optional_csscolorvalue(color) == color
+
+
+@pytest.mark.parametrize("color", ["reddish", "#ggg", "#12345", "rgb(0, 0"])
+def test_optional_csscolorvalue_invalid(color):
+    with pytest.raises(ValueError):
+        optional_csscolorvalue(color)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "slide asset not found: missing.png",
+        "'incremental item' didn't create any fragments",
+        "slide may overflow",
+        "fragments have no effect in speaker notes",
+    ],
+)
+@pytest.mark.sphinx(buildername="revealjs-lint", testroot="revealjs-lint")
+def test_revealjs_lint(app, warning, message):
+    app.build()
+
+    assert message in warning.getvalue()
+
+
+@pytest.mark.sphinx(buildername="revealjs-lint", testroot="revealjs-lint")
+def test_revealjs_lint_cache(app, warning):
+    app.build()
+    app.builder.init()
+    app.builder.write(None, [])
+
+    assert app.builder.linted == set()
+    assert "slide may overflow" in warning.getvalue()
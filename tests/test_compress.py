@@ -0,0 +1,83 @@
+import gzip
+import shutil
+
+import pytest
+
+from sphinxcontrib.revealjs.compress import (
+    compress_file,
+    find_outdated,
+    remove_stale_sidecars,
+    sidecar_formats,
+)
+
+
+def test_compress_file(tmp_path):
+    filename = tmp_path / "reveal.css"
+    filename.write_text(".reveal { color: red; }" * 100)
+
+    compress_file(str(filename))
+
+    assert gzip.decompress((tmp_path / "reveal.css.gz").read_bytes()) == (
+        filename.read_bytes()
+    )
+    for suffix in sidecar_formats():
+        sidecar = tmp_path / ("reveal.css" + suffix)
+        assert sidecar.stat().st_mtime_ns == filename.stat().st_mtime_ns
+
+
+def test_find_outdated(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "image.png").write_bytes(b"")
+
+    outdated, hashes = find_outdated(str(tmp_path), {})
+    assert outdated == [str(tmp_path / "index.html")]
+
+    compress_file(outdated[0])
+    # Rewriting a file with the same contents doesn't make it outdated.
+    (tmp_path / "index.html").write_text("<html></html>")
+    outdated, _ = find_outdated(str(tmp_path), hashes)
+    assert outdated == []
+
+
+def test_find_outdated_after_moving_outdir(tmp_path):
+    outdir = tmp_path / "build"
+    outdir.mkdir()
+    (outdir / "index.html").write_text("<html></html>")
+
+    outdated, hashes = find_outdated(str(outdir), {})
+    compress_file(outdated[0])
+    shutil.copytree(outdir, tmp_path / "moved", copy_function=shutil.copy2)
+
+    outdated, _ = find_outdated(str(tmp_path / "moved"), hashes)
+    assert outdated == []
+
+
+def test_remove_stale_sidecars(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "old.html").write_text("<html></html>")
+    (tmp_path / "archive.tar.gz").write_bytes(b"")
+
+    _, previous = find_outdated(str(tmp_path), {})
+    for filename in ("index.html", "old.html"):
+        compress_file(str(tmp_path / filename))
+    (tmp_path / "old.html").unlink()
+
+    _, hashes = find_outdated(str(tmp_path), previous)
+    removed = remove_stale_sidecars(str(tmp_path), previous, hashes)
+
+    assert removed == [
+        str(tmp_path / ("old.html" + suffix)) for suffix in sidecar_formats()
+    ]
+    assert (tmp_path / "index.html.gz").exists()
+    assert (tmp_path / "archive.tar.gz").exists()
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="builder-revealjs",
+    confoverrides={"revealjs_precompress": True},
+)
+def test_revealjs_precompress(app):
+    app.build()
+
+    assert (app.outdir / "index.html.gz").exists()
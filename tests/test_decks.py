@@ -0,0 +1,116 @@
+import json
+import re
+
+import pytest
+from docutils import nodes
+from sphinx.util.docutils import new_document
+
+from sphinxcontrib.revealjs import addnodes
+from sphinxcontrib.revealjs.decks import (
+    DeckError,
+    build_deck,
+    deck_to_rst,
+    load_deck,
+    make_slide,
+)
+
+DECK = {
+    "title": "Review",
+    "slides": [
+        {
+            "title": "Intro",
+            "content": [
+                "Hello",
+                {"bullets": ["one", "two"], "incremental": "item"},
+            ],
+            "notes": "Say hi",
+            "slides": [{"title": "Details", "content": [{"fragment": "x"}]}],
+        },
+        {"title": "Intro", "content": ["Again"]},
+    ],
+}
+
+
+def test_build_deck():
+    document = new_document("deck.json")
+    build_deck(DECK, document)
+
+    deck = document[0]
+    intro, details, again = list(document.traverse(nodes.section))[1:]
+
+    assert document["revealjs_deck"]
+    assert deck[0].astext() == "Review"
+    assert intro["ids"] == ["intro"]
+    assert details["ids"] == ["details"]
+    assert re.fullmatch(r"intro-[0-9a-f]{8}", again["ids"][0])
+    assert [item["classes"] for item in intro.traverse(nodes.list_item)] == [
+        ["fragment"],
+        ["fragment"],
+    ]
+    assert intro.next_node(addnodes.speakernote).astext() == "Say hi"
+    assert details.next_node(nodes.container)["classes"] == ["fragment"]
+    assert not list(document.traverse(addnodes.newslide))
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"title": "Bad", "transition": "sideways"},
+        {"title": "Bad", "background-color": "not a colour"},
+        {"title": "Bad", "background-image": "local.png"},
+        {"title": "Bad", "content": [{"video": "clip.mp4"}]},
+        {"title": "Bad", "content": [{"bullets": ["x"], "incremental": "?"}]},
+        {"title": "Bad", "slides": [{"title": "Sub", "slides": [{}]}]},
+        {"content": ["No title"]},
+    ],
+)
+def test_make_slide_errors(spec):
+    with pytest.raises(DeckError):
+        make_slide(spec)
+
+
+def test_load_deck_yaml():
+    pytest.importorskip("yaml")
+
+    assert load_deck("slides:\n  - title: A\n", "index.deck.yaml") == {
+        "slides": [{"title": "A"}]
+    }
+
+
+def test_load_deck_invalid():
+    with pytest.raises(DeckError):
+        load_deck("{", "index.deck.json")
+
+
+def get_slides(html):
+    return re.search(r'<div class="slides">(.*?)</div>\s*<footer', html, re.S)[
+        1
+    ]
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-decks")
+def test_deck_matches_rst(app):
+    data = json.loads((app.srcdir / "index.deck.json").read_text())
+    (app.srcdir / "same.rst").write_text(":orphan:\n\n" + deck_to_rst(data))
+    app.build(force_all=True)
+
+    deck = (app.outdir / "index.html").read_text()
+    rst = (app.outdir / "same.html").read_text()
+
+    assert 'class="fragment docutils container"' in deck
+    assert '<aside class="notes">' in deck
+    assert get_slides(deck) == get_slides(rst)
+
+
+@pytest.mark.sphinx(buildername="revealjs", testroot="revealjs-decks")
+def test_deck_slide_options(app, warning):
+    app.build(force_all=True)
+
+    html = (app.outdir / "options.html").read_text()
+
+    assert (
+        '<section class="dark section" data-background-color="#002b36" '
+        'data-transition="fade" id="colours">'
+    ) in html
+    assert re.search(r'id="colours-[0-9a-f]{8}"', html)
+    assert "invalid deck" in warning.getvalue()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from sphinxcontrib.revealjs.multiplex import (
+    MultiplexServer,
+    loadtest,
+    make_credentials,
+    socket_id,
+)
+
+
+def run_with_server(test, interval=0.01):
+    async def main():
+        multiplex = MultiplexServer(interval=interval)
+        server = await multiplex.serve("127.0.0.1", 0)
+        port = list(server.sockets)[0].getsockname()[1]
+        try:
+            await test(multiplex, f"ws://127.0.0.1:{port}")
+        finally:
+            server.close()
+            await server.wait_closed()
+            multiplex.close()
+
+    asyncio.run(main())
+
+
+def test_make_credentials():
+    secret, deck_id = make_credentials()
+
+    assert socket_id(secret) == deck_id
+    assert secret != deck_id
+
+
+def test_multiplex_coalesces_states():
+    secret, deck_id = make_credentials()
+
+    async def test(multiplex, url):
+        async with connect(url) as follower, connect(url) as master:
+            await follower.send(
+                json.dumps({"role": "follower", "id": deck_id})
+            )
+            await master.send(
+                json.dumps({"role": "master", "id": deck_id, "secret": secret})
+            )
+            for indexh in range(10):
+                await master.send(json.dumps({"state": {"indexh": indexh}}))
+
+            message = await asyncio.wait_for(follower.recv(), timeout=5)
+            assert json.loads(message)["state"]["indexh"] == 9
+            assert multiplex.broadcasts == 1
+
+            # Late joiners get the latest state straight away.
+            async with connect(url) as late:
+                await late.send(
+                    json.dumps({"role": "follower", "id": deck_id})
+                )
+                message = await asyncio.wait_for(late.recv(), timeout=5)
+                assert json.loads(message)["state"]["indexh"] == 9
+
+    run_with_server(test)
+
+
+def test_multiplex_rejects_invalid_secret():
+    _, deck_id = make_credentials()
+
+    async def test(multiplex, url):
+        async with connect(url) as master:
+            await master.send(
+                json.dumps({"role": "master", "id": deck_id, "secret": "x"})
+            )
+            with pytest.raises(ConnectionClosed):
+                await asyncio.wait_for(master.recv(), timeout=5)
+
+    run_with_server(test)
+
+
+def test_multiplex_loadtest():
+    stats = asyncio.run(loadtest(followers=50, changes=20, rate=200))
+
+    assert stats["completed"] == 50
+
+
+def test_multiplex_removes_empty_rooms():
+    _, deck_id = make_credentials()
+
+    async def wait_for_rooms(multiplex, count):
+        for _ in range(500):
+            if len(multiplex.rooms) == count:
+                return
+            await asyncio.sleep(0.01)
+
+    async def test(multiplex, url):
+        for _ in range(20):
+            async with connect(url) as master:
+                hello = {"role": "master", "id": deck_id, "secret": "x"}
+                await master.send(json.dumps(hello))
+                with pytest.raises(ConnectionClosed):
+                    await master.recv()
+        assert multiplex.rooms == {}
+
+        async with connect(url) as follower:
+            await follower.send(
+                json.dumps({"role": "follower", "id": deck_id})
+            )
+            await wait_for_rooms(multiplex, 1)
+            task = multiplex.rooms[deck_id].task
+
+        await wait_for_rooms(multiplex, 0)
+        assert multiplex.rooms == {}
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+
+    run_with_server(test)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from sphinxcontrib.revealjs.serviceworker import build_manifest
+
+
+def test_build_manifest(tmp_path):
+    (tmp_path / "_static/plugin/notes").mkdir(parents=True)
+    (tmp_path / "_static/reveal.js").write_text("reveal")
+    (tmp_path / "_static/reveal.js.gz").write_bytes(b"")
+    (tmp_path / "_static/plugin/notes/notes.js").write_text("notes")
+    (tmp_path / "_sources").mkdir()
+    (tmp_path / "_sources/index.rst.txt").write_text("Index")
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "genindex.html").write_text("<html></html>")
+    (tmp_path / "sw.js").write_text("")
+
+    manifest, revisions = build_manifest(
+        str(tmp_path),
+        {"index.html": ["_static/plugin/notes/notes.js", "_images/gone.png"]},
+    )
+
+    assert [url for url, _ in manifest["shared"]] == ["_static/reveal.js"]
+    assert [url for url, _ in manifest["decks"]["index.html"]] == [
+        "_static/plugin/notes/notes.js",
+        "index.html",
+    ]
+    assert revisions["index.html"][2] == (
+        dict(manifest["decks"]["index.html"])["index.html"]
+    )
+
+
+def test_build_manifest_reuses_unchanged_revisions(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    _, revisions = build_manifest(str(tmp_path), {"index.html": []})
+
+    size, mtime, _ = revisions["index.html"]
+    manifest, _ = build_manifest(
+        str(tmp_path),
+        {"index.html": []},
+        {"index.html": (size, mtime, "cached")},
+    )
+
+    assert manifest["decks"] == {"index.html": [("index.html", "cached")]}
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="revealjs-assets",
+    confoverrides={"revealjs_service_worker": True},
+)
+def test_revealjs_service_worker(app):
+    app.build()
+
+    manifest = json.loads((app.outdir / "precache-manifest.json").read_text())
+    index = [url for url, _ in manifest["decks"]["index.html"]]
+    other = [url for url, _ in manifest["decks"]["other.html"]]
+
+    assert "index.html" in index
+    assert "_images/img/bg.png" in index
+    assert other == ["other.html"]
+    assert all(not url.startswith("_sources/") for url in index + other)
+    assert manifest["version"] in (app.outdir / "sw.js").read_text()
+    assert "serviceWorker.register" in (app.outdir / "index.html").read_text()
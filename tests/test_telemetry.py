@@ -0,0 +1,85 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from sphinxcontrib.revealjs.telemetry import (
+    TelemetryServer,
+    read_samples,
+    summarize,
+)
+
+
+@pytest.fixture
+def collector(tmp_path):
+    filename = tmp_path / "telemetry.jsonl"
+    server = TelemetryServer(("127.0.0.1", 0), str(filename))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}", filename
+
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body):
+    request = Request(url, data=body, headers={"Content-Type": "text/plain"})
+    with urlopen(request) as response:
+        return response.status, response.headers
+
+
+def test_collector(collector):
+    url, filename = collector
+    payload = {
+        "deck": "/index.html",
+        "samples": [
+            {"slide": "intro", "kind": "transition", "value": 120},
+            {"slide": "intro", "kind": "unknown", "value": 1},
+            {"slide": "chart", "kind": "decode", "value": 80.5},
+        ],
+    }
+
+    status, headers = post(url, json.dumps(payload).encode())
+
+    assert status == 204
+    assert headers["Access-Control-Allow-Origin"] == "*"
+    samples = list(read_samples(str(filename)))
+    assert [(s["slide"], s["kind"], s["value"]) for s in samples] == [
+        ("intro", "transition", 120.0),
+        ("chart", "decode", 80.5),
+    ]
+    assert {s["deck"] for s in samples} == {"/index.html"}
+
+
+def test_collector_rejects_invalid_payload(collector):
+    url, filename = collector
+
+    with pytest.raises(HTTPError) as excinfo:
+        post(url, b"not json")
+
+    assert excinfo.value.code == 400
+    assert not filename.exists()
+
+
+def test_summarize():
+    samples = [
+        {"deck": "a", "slide": "light", "kind": "transition", "value": 10},
+        {"deck": "a", "slide": "light", "kind": "transition", "value": 30},
+        {"deck": "a", "slide": "heavy", "kind": "transition", "value": 300},
+        {"deck": "a", "slide": "heavy", "kind": "longtask", "value": 120},
+        {"deck": "a", "slide": "heavy", "kind": "decode", "value": 60},
+        {"deck": "b", "slide": "other", "kind": "longtask", "value": 50},
+    ]
+
+    decks = summarize(samples)
+
+    assert [s.slide for s in decks["a"]] == ["heavy", "light"]
+    heavy, light = decks["a"]
+    assert heavy.cost == 300 + 120 + 60
+    assert light.views == 2
+    assert light.transition_p50 == 20
+    assert light.transition_max == 30
+    assert decks["b"][0].long_tasks == 1
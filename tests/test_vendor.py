@@ -0,0 +1,138 @@
+import json
+import re
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sphinxcontrib.revealjs.vendor import AssetCache, FetchResult
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """Serve ``tmp_path / "remote"`` on localhost, recording requests."""
+
+    root = tmp_path / "remote"
+    root.mkdir()
+    requests = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def send_response(self, code, message=None):
+            requests.append((self.path, code))
+            super().send_response(code, message)
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(Handler, directory=str(root))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}", root, requests
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_asset_cache(tmp_path, http_server):
+    url, root, requests = http_server
+    (root / "logo.png").write_bytes(b"logo")
+
+    cache = AssetCache(str(tmp_path / "cache"))
+    filename = cache.get(f"{url}/logo.png")
+
+    assert open(filename, "rb").read() == b"logo"
+    assert filename.endswith(".png")
+
+    # Fresh entries are reused without a request, even by a new cache.
+    assert AssetCache(str(tmp_path / "cache")).get(f"{url}/logo.png") == (
+        filename
+    )
+    assert requests == [("/logo.png", 200)]
+
+
+def test_asset_cache_revalidates(tmp_path, http_server):
+    url, root, requests = http_server
+    (root / "logo.png").write_bytes(b"logo")
+
+    cache = AssetCache(str(tmp_path / "cache"), max_age=0)
+    filename = cache.get(f"{url}/logo.png")
+
+    assert cache.get(f"{url}/logo.png") == filename
+    assert requests == [("/logo.png", 200), ("/logo.png", 304)]
+
+
+def test_asset_cache_uses_stale_copy_when_offline(tmp_path, http_server):
+    url, root, _ = http_server
+    (root / "logo.png").write_bytes(b"logo")
+
+    cache = AssetCache(str(tmp_path / "cache"), max_age=0)
+    filename = cache.get(f"{url}/logo.png")
+    (root / "logo.png").unlink()
+
+    assert cache.get(f"{url}/logo.png") == filename
+
+
+def test_asset_cache_uses_stale_copy_on_error_status(tmp_path):
+    statuses = [200, 503, 503]
+
+    def fetcher(url, headers):
+        return FetchResult(statuses.pop(0), {}, b"logo")
+
+    cache = AssetCache(str(tmp_path / "cache"), fetcher, max_age=0)
+    filename = cache.get("https://example.com/logo.png")
+
+    assert cache.get("https://example.com/logo.png") == filename
+
+    with pytest.raises(OSError):
+        AssetCache(str(tmp_path / "other"), fetcher).get(
+            "https://example.com/logo.png"
+        )
+
+
+def fake_fetcher(url, headers):
+    return FetchResult(200, {"Content-Type": "image/png"}, url.encode())
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="revealjs-vendor",
+    confoverrides={
+        "revealjs_vendor_remote_assets": True,
+        "revealjs_vendor_fetcher": fake_fetcher,
+    },
+)
+def test_revealjs_vendor_remote_assets(app):
+    app.build()
+
+    content = (app.outdir / "index.html").read_text()
+    images = list((app.outdir / "_images").listdir())
+
+    assert 'src="https://' not in content
+    assert 'data-background-image="https://' not in content
+    assert 'alt="https://example.com/logo.png"' in content
+    assert len(images) == 2
+    for image in images:
+        assert f"_images/{image}" in content
+
+
+@pytest.mark.sphinx(
+    buildername="revealjs",
+    testroot="revealjs-vendor",
+    confoverrides={
+        "revealjs_vendor_remote_assets": True,
+        "revealjs_vendor_fetcher": fake_fetcher,
+        "revealjs_service_worker": True,
+    },
+)
+def test_revealjs_vendor_remote_assets_precached(app):
+    app.build()
+
+    content = (app.outdir / "index.html").read_text()
+    background = re.search(r'data-background-image="([^"]+)"', content)
+    manifest = json.loads((app.outdir / "precache-manifest.json").read_text())
+
+    assert background.group(1) in dict(manifest["decks"]["index.html"])